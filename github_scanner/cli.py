@@ -21,6 +21,7 @@ def _build_parser() -> argparse.ArgumentParser:
     parser.add_argument("--no-docs-only", dest="docs_only", action="store_false", help="Disable documentation-only restriction")
     parser.add_argument("--owned-only", dest="owned_only", action="store_true", help="Only include repositories owned by the profile")
     parser.add_argument("--no-owned-only", dest="owned_only", action="store_false", help="Include public repositories beyond owned ones")
+    parser.add_argument("--concurrency", type=int, help="Number of repositories to scan in parallel")
     parser.add_argument("--output-dir", dest="output_dir", type=Path, help="Directory for the generated report")
     parser.set_defaults(docs_only=None, owned_only=None)
     return parser
@@ -35,6 +36,8 @@ def app(argv: list[str] | None = None) -> None:
         config.modes.docs_only = args.docs_only
     if args.owned_only is not None:
         config.modes.owned_repos_only = args.owned_only
+    if args.concurrency:
+        config.modes.concurrency = args.concurrency
     if args.output_dir:
         config.output.directory = args.output_dir
 
@@ -6,14 +6,21 @@ from typing import Any, Dict, Optional
 
 import yaml
 
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # pragma: no cover - libyaml not available
+    from yaml import SafeLoader  # type: ignore[assignment]
+
 
 DEFAULT_CONFIG_PATH = Path("config/settings.yaml")
+DEFAULT_LLM_CACHE_PATH = Path(".cache/llm_responses.sqlite3")
 
 
 @dataclass(slots=True)
 class ModeConfig:
     docs_only: bool = True
     owned_repos_only: bool = True
+    concurrency: int = 16
 
 
 @dataclass(slots=True)
@@ -24,6 +31,7 @@ class LLMConfig:
     max_output_tokens: int = 1200
     api_key_env: str = "OPENAI_API_KEY"
     organization: Optional[str] = None
+    cache_path: Optional[Path] = DEFAULT_LLM_CACHE_PATH
 
 
 @dataclass(slots=True)
@@ -46,16 +54,18 @@ def load_config(path: Optional[Path] = None) -> AppConfig:
         return AppConfig()
 
     with config_path.open("r", encoding="utf-8") as handle:
-        raw: Dict[str, Any] = yaml.safe_load(handle) or {}
+        raw: Dict[str, Any] = yaml.load(handle, Loader=SafeLoader) or {}
 
     modes_raw = raw.get("modes", {})
     llm_raw = raw.get("llm", {})
     output_raw = raw.get("output", {})
+    llm_cache_path = llm_raw.get("cache_path", str(DEFAULT_LLM_CACHE_PATH))
 
     config = AppConfig(
         modes=ModeConfig(
             docs_only=bool(modes_raw.get("docs_only", True)),
             owned_repos_only=bool(modes_raw.get("owned_repos_only", True)),
+            concurrency=int(modes_raw.get("concurrency", 16)),
         ),
         llm=LLMConfig(
             provider=str(llm_raw.get("provider", "openai")),
@@ -64,6 +74,7 @@ def load_config(path: Optional[Path] = None) -> AppConfig:
             max_output_tokens=int(llm_raw.get("max_output_tokens", 1200)),
             api_key_env=str(llm_raw.get("api_key_env", "OPENAI_API_KEY")),
             organization=llm_raw.get("organization"),
+            cache_path=Path(llm_cache_path) if llm_cache_path else None,
         ),
         output=OutputConfig(
             directory=Path(output_raw.get("directory", "reports")),
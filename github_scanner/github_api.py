@@ -1,72 +1,240 @@
 from __future__ import annotations
 
 import os
-from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from itertools import cycle
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 import requests
 from requests import Response
-from tenacity import retry, stop_after_attempt, wait_exponential
+from requests.adapters import HTTPAdapter
+from tenacity import RetryError, retry, retry_if_not_exception_type, stop_after_attempt, wait_exponential
 
 API_ROOT = "https://api.github.com"
+GRAPHQL_URL = f"{API_ROOT}/graphql"
 _USER_AGENT = "github-scanner/0.1"
+_MAX_CONNECTIONS = 64
+HTTP_CACHE_NAME = ".cache/github_http"
+_HTTP_CACHE_EXPIRE_SECONDS = 3600
+_UNCACHED_URL_PATTERNS = ("raw.githubusercontent.com/*",)
+_USER_REPOS_QUERY = """
+query($login: String!, $affiliations: [RepositoryAffiliation], $cursor: String) {
+  user(login: $login) {
+    repositories(first: 100, after: $cursor, privacy: PUBLIC, ownerAffiliations: $affiliations, orderBy: {field: PUSHED_AT, direction: DESC}) {
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        name
+        nameWithOwner
+        url
+        description
+        stargazerCount
+        forkCount
+        issues(states: OPEN) { totalCount }
+        pullRequests(states: OPEN) { totalCount }
+        defaultBranchRef { name }
+        repositoryTopics(first: 10) { nodes { topic { name } } }
+        languages(first: 100, orderBy: {field: SIZE, direction: DESC}) { edges { size node { name } } }
+        refs(refPrefix: "refs/heads/", first: 5) { nodes { name } }
+        readme: object(expression: "HEAD:README.md") { ... on Blob { text } }
+      }
+    }
+  }
+}
+"""
+
+
+class RateLimitError(requests.HTTPError):
+    pass
+
+
+class GraphQLQueryError(requests.HTTPError):
+    pass
 
 
 @dataclass(slots=True)
 class GitHubSession:
     http: requests.Session
-    rate_limited: bool = False
+    tokens: List[str] = field(default_factory=list, repr=False)
+    rate_limit_hit: threading.Event = field(default_factory=threading.Event, repr=False)
+    _token_cycle: Optional[Iterator[str]] = field(default=None, init=False, repr=False)
+    _token_lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.tokens:
+            self._token_cycle = cycle(self.tokens)
 
     @classmethod
     def create(cls) -> "GitHubSession":
-        session = requests.Session()
+        session = create_http_session()
         headers = {
             "Accept": "application/vnd.github+json",
             "User-Agent": _USER_AGENT,
         }
-        token = os.getenv("GITHUB_TOKEN")
-        if token:
-            headers["Authorization"] = f"Bearer {token}"
         session.headers.update(headers)
-        return cls(http=session)
+        session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=_MAX_CONNECTIONS))
+        return cls(http=session, tokens=_load_tokens())
+
+    @property
+    def rate_limited(self) -> bool:
+        return self.rate_limit_hit.is_set()
+
+    def mark_rate_limited(self) -> None:
+        self.rate_limit_hit.set()
+
+    def next_auth_headers(self) -> Dict[str, str]:
+        if self._token_cycle is None:
+            return {}
+        with self._token_lock:
+            token = next(self._token_cycle)
+        return {"Authorization": f"Bearer {token}"}
 
     def close(self) -> None:
         self.http.close()
 
 
+def create_http_session(urls_expire_after: Optional[Dict[str, int]] = None) -> requests.Session:
+    try:
+        import requests_cache  # type: ignore
+    except ImportError:
+        return requests.Session()
+    # Raw file downloads are size-capped while streaming; caching them would pull the whole body first.
+    uncached = {pattern: requests_cache.DO_NOT_CACHE for pattern in _UNCACHED_URL_PATTERNS}
+    return requests_cache.CachedSession(
+        cache_name=HTTP_CACHE_NAME,
+        backend="sqlite",
+        expire_after=_HTTP_CACHE_EXPIRE_SECONDS,
+        urls_expire_after={**uncached, **(urls_expire_after or {})},
+        cache_control=True,
+        stale_if_error=True,
+    )
+
+
+def _load_tokens() -> List[str]:
+    tokens = [token.strip() for token in os.getenv("GITHUB_TOKENS", "").split(",") if token.strip()]
+    if not tokens:
+        token = os.getenv("GITHUB_TOKEN")
+        if token:
+            tokens.append(token)
+    return tokens
+
+
 def _raise_for_status(response: Response) -> None:
     try:
         response.raise_for_status()
     except requests.HTTPError as error:
-        message = response.json().get("message") if response.headers.get("Content-Type", "").startswith("application/json") else response.text
+        message = response.text
+        if response.headers.get("Content-Type", "").startswith("application/json"):
+            try:
+                payload = response.json()
+            except ValueError:
+                payload = None
+            if isinstance(payload, dict):
+                message = payload.get("message", message)
         raise requests.HTTPError(f"GitHub API request failed: {response.status_code} {message}") from error
 
 
-@retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=1, max=8))
+@retry(
+    stop=stop_after_attempt(3),
+    wait=wait_exponential(multiplier=1, min=1, max=8),
+    retry=retry_if_not_exception_type(RateLimitError),
+)
 def _get(session: GitHubSession, path: str, params: Optional[Dict[str, str]] = None) -> Response:
-    url = f"{API_ROOT}{path}"
-    response = session.http.get(url, params=params, timeout=30)
-    if response.status_code == 403 and "rate limit" in response.text.lower():
-        session.rate_limited = True
-        raise requests.HTTPError("GitHub API rate limit exceeded")
+    if session.rate_limited:
+        raise RateLimitError("GitHub API rate limit exceeded")
+    url = path if path.startswith(API_ROOT) else f"{API_ROOT}{path}"
+    for _ in range(max(1, len(session.tokens))):
+        response = session.http.get(url, params=params, headers=session.next_auth_headers(), timeout=30)
+        if not (response.status_code == 403 and "rate limit" in response.text.lower()):
+            break
+    else:
+        session.mark_rate_limited()
+        raise RateLimitError("GitHub API rate limit exceeded")
     _raise_for_status(response)
     return response
 
 
-def list_user_repos(session: GitHubSession, username: str, owned_only: bool = True, max_pages: int = 5) -> List[Dict[str, Any]]:
+@retry(
+    stop=stop_after_attempt(3),
+    wait=wait_exponential(multiplier=1, min=1, max=8),
+    retry=retry_if_not_exception_type((RateLimitError, GraphQLQueryError)),
+)
+def _post_graphql(session: GitHubSession, query: str, variables: Dict[str, Any]) -> Dict[str, Any]:
+    response = session.http.post(
+        GRAPHQL_URL,
+        json={"query": query, "variables": variables},
+        headers=session.next_auth_headers(),
+        timeout=30,
+    )
+    if response.status_code == 403 and "rate limit" in response.text.lower():
+        raise RateLimitError("GitHub GraphQL rate limit exceeded")
+    _raise_for_status(response)
+    body = response.json()
+    errors = body.get("errors") or []
+    if errors:
+        if any(error.get("type") == "RATE_LIMITED" for error in errors):
+            raise RateLimitError("GitHub GraphQL rate limit exceeded")
+        raise GraphQLQueryError(f"GitHub GraphQL query failed: {errors[0].get('message', 'unknown error')}")
+    return body.get("data") or {}
+
+
+def graphql_user_bundle(
+    session: GitHubSession, username: str, owned_only: bool = True, max_pages: int = 10
+) -> List[Dict[str, Any]]:
+    affiliations = ["OWNER"] if owned_only else ["OWNER", "COLLABORATOR", "ORGANIZATION_MEMBER"]
+    variables: Dict[str, Any] = {"login": username, "affiliations": affiliations, "cursor": None}
+    repos: List[Dict[str, Any]] = []
+    for _ in range(max_pages):
+        data = _post_graphql(session, _USER_REPOS_QUERY, variables)
+        user = data.get("user")
+        if not user:
+            raise GraphQLQueryError(f"GitHub user not found: {username}")
+        connection = user["repositories"]
+        repos.extend(_graphql_repo_payload(node) for node in connection["nodes"] if node)
+        page_info = connection.get("pageInfo") or {}
+        if not page_info.get("hasNextPage"):
+            break
+        variables["cursor"] = page_info.get("endCursor")
+    return repos
+
+
+def _graphql_repo_payload(node: Dict[str, Any]) -> Dict[str, Any]:
+    default_branch = (node.get("defaultBranchRef") or {}).get("name") or "main"
+    readme = node.get("readme") or {}
+    return {
+        "name": node.get("name", ""),
+        "full_name": node.get("nameWithOwner", ""),
+        "html_url": node.get("url", ""),
+        "description": node.get("description"),
+        "stargazers_count": node.get("stargazerCount", 0),
+        "forks_count": node.get("forkCount", 0),
+        "open_issues_count": (node.get("issues") or {}).get("totalCount", 0)
+        + (node.get("pullRequests") or {}).get("totalCount", 0),
+        "watchers_count": node.get("stargazerCount", 0),
+        "default_branch": default_branch,
+        "topics": [item["topic"]["name"] for item in (node.get("repositoryTopics") or {}).get("nodes", [])],
+        "languages": {edge["node"]["name"]: int(edge["size"]) for edge in (node.get("languages") or {}).get("edges", [])},
+        "branches": [ref["name"] for ref in (node.get("refs") or {}).get("nodes", []) if ref.get("name")],
+        "readme": readme.get("text") or "",
+    }
+
+
+def list_user_repos(session: GitHubSession, username: str, owned_only: bool = True, max_pages: int = 10) -> List[Dict[str, Any]]:
     repos: List[Dict[str, Any]] = []
-    params = {
+    path = f"/users/{username}/repos"
+    params: Optional[Dict[str, str]] = {
         "per_page": "100",
         "type": "owner" if owned_only else "all",
         "sort": "pushed",
     }
-    for page in range(1, max_pages + 1):
-        params["page"] = str(page)
-        response = _get(session, f"/users/{username}/repos", params=params)
-        page_items = response.json()
-        if not page_items:
+    for _ in range(max_pages):
+        response = _get(session, path, params=params)
+        repos.extend(response.json())
+        next_url = response.links.get("next", {}).get("url")
+        if not next_url:
             break
-        repos.extend(page_items)
+        path, params = next_url, None
     return repos
 
 
@@ -91,10 +259,48 @@ def list_directory_contents(session: GitHubSession, owner: str, repo: str, path:
     return data
 
 
-def retrieve_file(session: GitHubSession, download_url: str) -> str:
-    response = session.http.get(download_url, timeout=30)
-    _raise_for_status(response)
-    return response.text
+def get_recursive_tree(session: GitHubSession, owner: str, repo: str, sha: str) -> List[Dict[str, Any]]:
+    response = _get(session, f"/repos/{owner}/{repo}/git/trees/{sha}", params={"recursive": "1"})
+    return response.json().get("tree", [])
+
+
+def get_repo_tree(session: GitHubSession, owner: str, repo: str, ref: str) -> List[Dict[str, Any]]:
+    try:
+        return get_recursive_tree(session, owner, repo, ref)
+    except RetryError as error:
+        # Empty repositories (409) and missing refs (404) have no tree; anything else is a real failure.
+        if not isinstance(error.last_attempt.exception(), requests.HTTPError):
+            raise
+        return []
+    except RateLimitError:
+        raise
+    except requests.HTTPError:
+        return []
+
+
+def fetch_repo_bundle(
+    session: GitHubSession, owner: str, repo: str, ref: str
+) -> Tuple[Dict[str, int], List[str], List[Dict[str, Any]]]:
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        languages = executor.submit(get_repo_languages, session, owner, repo)
+        branches = executor.submit(list_repo_branches, session, owner, repo)
+        tree = executor.submit(get_repo_tree, session, owner, repo, ref)
+        return languages.result(), branches.result(), tree.result()
+
+
+def retrieve_file(session: GitHubSession, download_url: str, max_bytes: Optional[int] = None) -> str:
+    with session.http.get(download_url, timeout=30, stream=True) as response:
+        _raise_for_status(response)
+        if max_bytes is None:
+            return response.text
+        chunks: List[bytes] = []
+        remaining = max_bytes
+        for chunk in response.iter_content(chunk_size=8192):
+            chunks.append(chunk[:remaining])
+            remaining -= len(chunk)
+            if remaining <= 0:
+                break
+        return b"".join(chunks).decode(response.encoding or "utf-8", errors="ignore")
 
 
 def guess_username_from_profile(profile_url: str) -> str:
@@ -1,38 +1,99 @@
 from __future__ import annotations
 
+import asyncio
+import json
 import os
 import re
+import sqlite3
 from collections import Counter
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List
+from typing import Callable, Dict, List, Optional
 
 from .config import AppConfig
-from .models import ProfileContext, RepoReport
+from .llm_cache import SQLiteLLMCache, make_cache_key
+from .models import ProfileContext, RepoMetrics, RepoReport
 
 _MAX_REPO_DOC_CHARS = 1800
 _MAX_REPOS_IN_PROMPT = 8
+_MAX_CONCURRENT_SUMMARIES = 8
+_REPO_SUMMARY_TOKEN_BUDGET = 120
 _SENTENCE_SPLIT = re.compile(r"(?<=[.!?])\s+")
+_WS_RE = re.compile(r"\s+")
+_BANNED_PHRASES = (
+    "meet ",
+    "making waves",
+    "developer to watch",
+    "passionate developer",
+    "thrilling",
+    "exciting",
+    "definitely",
+    "keep an eye",
+    "great things",
+    "on the horizon",
+    "pushing the boundaries",
+)
+_BANNED_RE = re.compile("|".join(re.escape(phrase) for phrase in _BANNED_PHRASES))
+_REPO_SYSTEM_PROMPT = "\n".join(
+    [
+        "You summarise GitHub repositories for experienced developers using two factual sentences.",
+        "Explain the project's purpose, notable capabilities, and target users.",
+        "Avoid marketing adjectives, emojis, and hype.",
+        "The user message lists the repository name, description, tech stack, topics, and an optional documentation excerpt.",
+    ]
+)
+_REPO_BATCH_SYSTEM_PROMPT = "\n".join(
+    [
+        _REPO_SYSTEM_PROMPT,
+        "Repositories in the user message are separated by lines containing only ---; summarise each one separately.",
+        "Respond with a JSON object that maps every repository full name to its summary string.",
+    ]
+)
 
 
 def enrich_repo_summaries(context: ProfileContext, config: AppConfig) -> None:
     provider = config.llm.provider.lower()
     api_key = os.getenv(config.llm.api_key_env) if provider == "openai" else None
     if provider == "openai" and api_key:
+        cache = _open_cache(config)
         try:
-            from openai import OpenAI  # type: ignore
-
-            client = OpenAI(api_key=api_key, organization=config.llm.organization)
-            for report in context.repos:
-                summary = _summarize_repo_with_openai(client, report, config)
-                report.summary = summary or _fallback_repo_summary(report)
+            asyncio.run(_enrich_repo_summaries_async(context, config, api_key, cache))
             return
         except Exception:  # pragma: no cover - fall back to heuristic summaries
             pass
+        finally:
+            if cache is not None:
+                cache.close()
 
     for report in context.repos:
         report.summary = _fallback_repo_summary(report)
 
 
+async def _enrich_repo_summaries_async(
+    context: ProfileContext, config: AppConfig, api_key: str, cache: Optional[SQLiteLLMCache]
+) -> None:
+    from openai import AsyncOpenAI  # type: ignore
+
+    semaphore = asyncio.Semaphore(_MAX_CONCURRENT_SUMMARIES)
+    batch_size = max(1, config.llm.max_output_tokens // _REPO_SUMMARY_TOKEN_BUDGET)
+    batches = [context.repos[start : start + batch_size] for start in range(0, len(context.repos), batch_size)]
+    async with AsyncOpenAI(api_key=api_key, organization=config.llm.organization) as client:
+        batch_results = await asyncio.gather(
+            *(_summarize_repo_batch_async(client, batch, config, semaphore, cache) for batch in batches)
+        )
+        summaries: Dict[str, str] = {}
+        for result in batch_results:
+            summaries.update(result)
+        pending: List[RepoReport] = []
+        for report in context.repos:
+            summary = _condense_repo_summary(summaries.get(report.metrics.full_name, ""))
+            if summary:
+                report.summary = summary
+            else:
+                pending.append(report)
+        await asyncio.gather(*(_summarize_repo_async(client, report, config, semaphore, cache) for report in pending))
+
+
 def generate_summary(context: ProfileContext, config: AppConfig) -> str:
     prompt = _build_prompt(context)
     provider = config.llm.provider.lower()
@@ -40,35 +101,72 @@ def generate_summary(context: ProfileContext, config: AppConfig) -> str:
         api_key = os.getenv(config.llm.api_key_env)
         if not api_key:
             return _fallback_summary(context, missing_key=config.llm.api_key_env)
+        cache = _open_cache(config)
         try:
-            from openai import OpenAI  # type: ignore
-
-            client = OpenAI(api_key=api_key, organization=config.llm.organization)
-            response = client.responses.create(
-                model=config.llm.model,
-                input=[
-                    {
-                        "role": "system",
-                        "content": "You craft crisp, professional GitHub profile spotlights for technical readers. Highlight language strengths, project domains, and practical outcomes without hype.",
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt,
-                    },
-                ],
-                max_output_tokens=min(config.llm.max_output_tokens, 600),
-                temperature=config.llm.temperature,
+            client = _openai_client(api_key, config.llm.organization)
+            messages = [
+                {
+                    "role": "system",
+                    "content": "You craft crisp, professional GitHub profile spotlights for technical readers. Highlight language strengths, project domains, and practical outcomes without hype.",
+                },
+                {
+                    "role": "user",
+                    "content": prompt,
+                },
+            ]
+            key = make_cache_key(config.llm.model, config.llm.temperature, messages)
+            text = _cached_text(
+                cache,
+                key,
+                lambda: _response_text(
+                    client.responses.create(
+                        model=config.llm.model,
+                        input=messages,
+                        max_output_tokens=min(config.llm.max_output_tokens, 600),
+                        temperature=config.llm.temperature,
+                    )
+                ),
             )
-            if response.output:
-                text = response.output[0].content[0].text.strip()
+            if text:
                 cleaned = _post_process_spotlight(text)
                 return cleaned or _fallback_summary(context)
             return _fallback_summary(context)
         except Exception as exc:  # pragma: no cover
             return _fallback_summary(context, error=str(exc))
+        finally:
+            if cache is not None:
+                cache.close()
     return _fallback_summary(context)
 
 
+@lru_cache(maxsize=4)
+def _openai_client(api_key: str, organization: Optional[str]) -> object:
+    from openai import OpenAI  # type: ignore
+
+    return OpenAI(api_key=api_key, organization=organization)
+
+
+def _open_cache(config: AppConfig) -> Optional[SQLiteLLMCache]:
+    if config.llm.cache_path is None:
+        return None
+    try:
+        return SQLiteLLMCache(config.llm.cache_path)
+    except (OSError, sqlite3.Error):  # pragma: no cover - caching is best effort
+        return None
+
+
+def _cached_text(cache: Optional[SQLiteLLMCache], key: str, compute: Callable[[], str]) -> str:
+    if cache is None:
+        return compute()
+    return cache.get_or_set(key, compute)
+
+
+def _response_text(response: object) -> str:
+    if response.output:
+        return response.output[0].content[0].text.strip()
+    return ""
+
+
 def _build_prompt(context: ProfileContext) -> str:
     lines: List[str] = []
     lines.append(f"Handle: {context.username}")
@@ -95,7 +193,7 @@ def _format_repo_for_prompt(report: RepoReport) -> str:
     metrics = report.metrics
     summary_text = _condense_repo_summary(report.summary or _fallback_repo_summary(report))
     stat_line = f"stars={metrics.stars}, forks={metrics.forks}, issues={metrics.open_issues}, watchers={metrics.watchers}"
-    language_line = _format_language_breakdown(metrics.languages)
+    language_line = _repo_language_breakdown(metrics)
     topics = ", ".join(report.metrics.topics[:6]) if report.metrics.topics else ""
     sections = [f"- {metrics.name}: {summary_text}", f"  Stats: {stat_line}"]
     if language_line:
@@ -139,10 +237,11 @@ def _fallback_summary(context: ProfileContext, missing_key: str | None = None, e
 
 
 def _aggregate_language_focus(context: ProfileContext) -> str:
+    if context.language_focus:
+        return context.language_focus
     counter: Counter[str] = Counter()
     for report in context.repos:
-        for name, count in report.metrics.languages.items():
-            counter[name] += count
+        counter.update(report.metrics.languages)
     if not counter:
         return ""
     total = sum(counter.values())
@@ -151,46 +250,111 @@ def _aggregate_language_focus(context: ProfileContext) -> str:
     for name, count in top_three:
         pct = round((count / total) * 100) if total else 0
         parts.append(f"{name} {pct}%")
-    return ", ".join(parts)
-
-
-def _summarize_repo_with_openai(client: object, report: RepoReport, config: AppConfig) -> str:
-    prompt = _build_repo_summary_prompt(report)
+    context.language_focus = ", ".join(parts)
+    return context.language_focus
+
+
+async def _summarize_repo_batch_async(
+    client: object,
+    reports: List[RepoReport],
+    config: AppConfig,
+    semaphore: asyncio.Semaphore,
+    cache: Optional[SQLiteLLMCache],
+) -> Dict[str, str]:
+    if len(reports) < 2:
+        return {}
+    prompt = "\n---\n".join(_build_repo_summary_prompt(report) for report in reports)
+    messages = [
+        {
+            "role": "system",
+            "content": _REPO_BATCH_SYSTEM_PROMPT,
+        },
+        {
+            "role": "user",
+            "content": prompt,
+        },
+    ]
+    temperature = min(0.7, max(0.1, config.llm.temperature))
+    key = make_cache_key(config.llm.model, temperature, messages)
+    cached = cache.get(key) if cache is not None else None
+    if cached is not None:
+        return _parse_batch_summaries(cached)
+    async with semaphore:
+        try:
+            response = await client.responses.create(
+                model=config.llm.model,
+                input=messages,
+                max_output_tokens=config.llm.max_output_tokens,
+                temperature=temperature,
+                text={"format": {"type": "json_object"}},
+            )
+        except Exception:  # pragma: no cover - per-repo calls handle the remainder
+            return {}
+    if getattr(response, "status", None) == "incomplete":
+        return {}
+    text = _response_text(response)
+    summaries = _parse_batch_summaries(text)
+    if cache is not None and summaries:
+        cache.set(key, text)
+    return summaries
+
+
+def _parse_batch_summaries(text: str) -> Dict[str, str]:
     try:
-        response = client.responses.create(
-            model=config.llm.model,
-            input=[
-                {
-                    "role": "system",
-                    "content": "You summarise GitHub repositories for experienced developers using two factual sentences.",
-                },
-                {
-                    "role": "user",
-                    "content": prompt,
-                },
-            ],
-            max_output_tokens=min(300, config.llm.max_output_tokens),
-            temperature=min(0.7, max(0.1, config.llm.temperature)),
-        )
-        if response.output:
-            text = response.output[0].content[0].text.strip()
-            return _condense_repo_summary(text)
-    except Exception:  # pragma: no cover - fallback below handles errors
-        pass
-    return ""
+        payload = json.loads(text)
+    except ValueError:
+        return {}
+    if not isinstance(payload, dict):
+        return {}
+    return {str(name): summary for name, summary in payload.items() if isinstance(summary, str)}
+
+
+async def _summarize_repo_async(
+    client: object,
+    report: RepoReport,
+    config: AppConfig,
+    semaphore: asyncio.Semaphore,
+    cache: Optional[SQLiteLLMCache],
+) -> None:
+    prompt = _build_repo_summary_prompt(report)
+    messages = [
+        {
+            "role": "system",
+            "content": _REPO_SYSTEM_PROMPT,
+        },
+        {
+            "role": "user",
+            "content": prompt,
+        },
+    ]
+    temperature = min(0.7, max(0.1, config.llm.temperature))
+    key = make_cache_key(config.llm.model, temperature, messages)
+    text = cache.get(key) if cache is not None else None
+    if text is None:
+        text = ""
+        async with semaphore:
+            try:
+                response = await client.responses.create(
+                    model=config.llm.model,
+                    input=messages,
+                    max_output_tokens=min(300, config.llm.max_output_tokens),
+                    temperature=temperature,
+                )
+                text = _response_text(response)
+            except Exception:  # pragma: no cover - fallback below handles errors
+                pass
+        if cache is not None and text:
+            cache.set(key, text)
+    report.summary = _condense_repo_summary(text) or _fallback_repo_summary(report)
 
 
 def _build_repo_summary_prompt(report: RepoReport) -> str:
     metrics = report.metrics
-    language_line = _format_language_breakdown(metrics.languages) or "unknown"
+    language_line = _repo_language_breakdown(metrics) or "unknown"
     topics = ", ".join(metrics.topics[:6]) if metrics.topics else "n/a"
     description = metrics.description or "No GitHub description provided."
     doc_excerpt = _prepare_repo_source_text(report)
     lines = [
-        "Summarize the GitHub repository below in two sentences for a technical audience.",
-        "Explain the project's purpose, notable capabilities, and target users.",
-        "Avoid marketing adjectives, emojis, and hype.",
-        "",
         f"Repository: {metrics.full_name}",
         f"Description: {description}",
         f"Tech stack: {language_line}",
@@ -205,10 +369,11 @@ def _build_repo_summary_prompt(report: RepoReport) -> str:
 def _prepare_repo_source_text(report: RepoReport) -> str:
     if not report.docs.files:
         return ""
-    sorted_docs = sorted(report.docs.files.items(), key=lambda item: _doc_priority(item[0]))
+    decorated = [(_doc_priority(path), path, raw) for path, raw in report.docs.files.items()]
+    decorated.sort()
     pieces: List[str] = []
     total = 0
-    for _, raw in sorted_docs:
+    for _, _, raw in decorated:
         if not raw:
             continue
         collapsed = _normalise_whitespace(raw)
@@ -243,7 +408,7 @@ def _fallback_repo_summary(report: RepoReport) -> str:
     doc_text = _prepare_repo_source_text(report)
     combined = " ".join(part for part in (description, doc_text) if part)
     primary = _select_sentences(combined, max_sentences=2, max_chars=320)
-    language_info = _format_language_breakdown(metrics.languages)
+    language_info = _repo_language_breakdown(metrics)
     focus_parts: List[str] = []
     if language_info:
         focus_parts.append(f"Tech stack: {language_info}.")
@@ -257,11 +422,17 @@ def _fallback_repo_summary(report: RepoReport) -> str:
     return condensed or f"{metrics.name} repository overview unavailable."
 
 
+def _repo_language_breakdown(metrics: RepoMetrics) -> str:
+    if not metrics.language_breakdown and metrics.languages:
+        metrics.language_breakdown = _format_language_breakdown(metrics.languages)
+    return metrics.language_breakdown
+
+
 def _format_language_breakdown(languages: Dict[str, int], max_items: int = 3) -> str:
     if not languages:
         return ""
     total = sum(languages.values())
-    sorted_items = sorted(languages.items(), key=lambda item: item[1], reverse=True)
+    sorted_items = sorted(languages.items(), key=lambda item: (-item[1], item[0]))
     if max_items:
         sorted_items = sorted_items[:max_items]
     parts = []
@@ -278,7 +449,7 @@ def _select_sentences(text: str, max_sentences: int, max_chars: int) -> str:
     cleaned = _normalise_whitespace(text)
     if not cleaned:
         return ""
-    sentences = _SENTENCE_SPLIT.split(cleaned)
+    sentences = _SENTENCE_SPLIT.split(cleaned, maxsplit=max_sentences)[:max_sentences]
     picked: List[str] = []
     total_chars = 0
     for sentence in sentences:
@@ -292,7 +463,7 @@ def _select_sentences(text: str, max_sentences: int, max_chars: int) -> str:
 
 
 def _normalise_whitespace(text: str) -> str:
-    return " ".join(text.strip().split())
+    return _WS_RE.sub(" ", text).strip()
 
 
 def _post_process_spotlight(text: str) -> str:
@@ -309,30 +480,17 @@ def _post_process_spotlight(text: str) -> str:
         stripped_lines.append(line)
     combined = " ".join(stripped_lines)
     combined = _normalise_whitespace(combined)
-    ascii_only = combined.encode("ascii", "ignore").decode("ascii")
+    ascii_only = combined if combined.isascii() else combined.encode("ascii", "ignore").decode("ascii")
     if not ascii_only:
         return ""
     sentences = _SENTENCE_SPLIT.split(ascii_only)
     filtered: List[str] = []
-    banned_phrases = (
-        "meet ",
-        "making waves",
-        "developer to watch",
-        "passionate developer",
-        "thrilling",
-        "exciting",
-        "definitely",
-        "keep an eye",
-        "great things",
-        "on the horizon",
-        "pushing the boundaries",
-    )
     for sentence in sentences:
         candidate = sentence.strip()
         if not candidate:
             continue
         lower = candidate.lower()
-        if any(phrase in lower for phrase in banned_phrases):
+        if _BANNED_RE.search(lower):
             continue
         if candidate.endswith("!"):
             candidate = candidate.rstrip("!").rstrip()
@@ -34,6 +34,7 @@ class RepoMetrics:
     languages: Dict[str, int] = field(default_factory=dict)
     topics: List[str] = field(default_factory=list)
     popular_branches: List[str] = field(default_factory=list)
+    language_breakdown: str = ""
 
 
 @dataclass(slots=True)
@@ -50,3 +51,9 @@ class ProfileContext:
     contributions: ContributionStats
     repos: List[RepoReport]
     generated_at: date
+    language_focus: str = ""
+    generated_at_iso: str = ""
+
+    def __post_init__(self) -> None:
+        if not self.generated_at_iso:
+            self.generated_at_iso = self.generated_at.isoformat()
@@ -1,7 +1,10 @@
 from __future__ import annotations
 
+import heapq
+import io
+from operator import itemgetter
 from pathlib import Path
-from typing import Dict, List
+from typing import Callable, Dict
 
 from .config import AppConfig
 from .models import ProfileContext, RepoMetrics, RepoReport
@@ -17,83 +20,60 @@ def write_report(context: ProfileContext, summary: str, config: AppConfig) -> Pa
 
 
 def _render_markdown(context: ProfileContext, summary: str, config: AppConfig) -> str:
-    lines: List[str] = []
-    lines.append(f"# GitHub Profile Summary: {context.username}")
-    lines.append("")
-    lines.append(f"Generated on: {context.generated_at.isoformat()}")
-    lines.append(f"Profile: {context.profile_url}")
-    lines.append("")
-    lines.append("Auto Generated profile readme via [GHProfScanner](https://github.com/MarcoBetti1/GHProfScanner)")
-    lines.append("")
-    lines.append("## Spotlight")
-    lines.append(summary.strip())
-    lines.append("")
+    buffer = io.StringIO()
+    write = buffer.write
+    write(f"# GitHub Profile Summary: {context.username}\n\n")
+    write(f"Generated on: {context.generated_at_iso}\n")
+    write(f"Profile: {context.profile_url}\n\n")
+    write("Auto Generated profile readme via [GHProfScanner](https://github.com/MarcoBetti1/GHProfScanner)\n\n")
+    write(f"## Spotlight\n{summary.strip()}\n\n")
     if context.contributions.yearly_counts:
-        lines.append("## Contribution Stats")
+        write("## Contribution Stats\n")
         for year, count in context.contributions.yearly_counts.items():
-            lines.append(f"- {year}: {count} contributions")
-        lines.append("")
-    lines.append("## Public Repositories")
+            write(f"- {year}: {count} contributions\n")
+        write("\n")
+    write("## Public Repositories\n")
     if not context.repos:
-        lines.append("No repositories found under the current mode settings.")
-        return "\n".join(lines)
-
+        write("No repositories found under the current mode settings.\n")
+    show_tables = config.output.show_repo_tables
     for report in context.repos:
-        lines.extend(_render_repo(report, config))
-        lines.append("")
-    return "\n".join(lines)
+        _render_repo(report, show_tables, write)
+        write("\n")
+    # Every line is newline-terminated; drop the final terminator so the file ends like a joined line list.
+    return buffer.getvalue()[:-1]
 
 
-def _render_repo(report: RepoReport, config: AppConfig) -> List[str]:
+def _render_repo(report: RepoReport, show_tables: bool, write: Callable[[str], int]) -> None:
     metrics = report.metrics
     summary_text = (report.summary or "Summary unavailable.").strip()
-    if not config.output.show_repo_tables and metrics.html_url:
+    if not show_tables and metrics.html_url:
         if summary_text:
             if summary_text.endswith("."):
                 summary_text = summary_text[:-1]
             summary_text = f"{summary_text}. Repository: {metrics.html_url}"
         else:
             summary_text = f"Repository: {metrics.html_url}"
-    lines = [f"### {metrics.name}"]
-    lines.append(summary_text)
-    lines.append("")
-    if config.output.show_repo_tables:
-        lines.extend(_render_repo_details(metrics))
-    return lines
+    write(f"### {metrics.name}\n{summary_text}\n\n")
+    if show_tables:
+        _render_repo_details(metrics, write)
 
 
-def _render_repo_details(metrics: RepoMetrics) -> List[str]:
-    rows: List[tuple[str, str]] = []
-    rows.append(("Repository", metrics.full_name))
-    rows.append(("Link", metrics.html_url))
-    rows.append(
-        (
-            "Stats",
-            "stars {stars}, forks {forks}, issues {issues}, watchers {watchers}".format(
-                stars=metrics.stars,
-                forks=metrics.forks,
-                issues=metrics.open_issues,
-                watchers=metrics.watchers,
-            ),
-        )
+def _render_repo_details(metrics: RepoMetrics, write: Callable[[str], int]) -> None:
+    write("| Field | Details |\n| --- | --- |\n")
+    write(f"| Repository | {metrics.full_name} |\n")
+    write(f"| Link | {metrics.html_url} |\n")
+    write(
+        f"| Stats | stars {metrics.stars}, forks {metrics.forks}, "
+        f"issues {metrics.open_issues}, watchers {metrics.watchers} |\n"
     )
     language_summary = _format_language_summary(metrics.languages)
     if language_summary:
-        rows.append(("Tech stack", language_summary))
+        write(f"| Tech stack | {language_summary} |\n")
     if metrics.topics:
-        rows.append(("Domains", ", ".join(metrics.topics[:6])))
-    branch_candidates = [branch for branch in metrics.popular_branches if branch]
-    deduped_branches: List[str] = []
-    for branch in branch_candidates:
-        if branch not in deduped_branches:
-            deduped_branches.append(branch)
+        write(f"| Domains | {', '.join(metrics.topics[:6])} |\n")
+    deduped_branches = list(dict.fromkeys(branch for branch in metrics.popular_branches if branch))
     if deduped_branches and not (len(deduped_branches) == 1 and deduped_branches[0].lower() == "main"):
-        rows.append(("Branches", ", ".join(deduped_branches)))
-
-    table_lines = ["| Field | Details |", "| --- | --- |"]
-    for label, value in rows:
-        table_lines.append(f"| {label} | {value} |")
-    return table_lines
+        write(f"| Branches | {', '.join(deduped_branches)} |\n")
 
 
 def _format_language_summary(languages: Dict[str, int], limit: int = 4) -> str:
@@ -102,9 +82,8 @@ def _format_language_summary(languages: Dict[str, int], limit: int = 4) -> str:
     total = sum(languages.values())
     if not total:
         return ""
-    sorted_items = sorted(languages.items(), key=lambda item: item[1], reverse=True)[:limit]
-    parts = []
-    for name, count in sorted_items:
-        pct = round((count / total) * 100)
-        parts.append(f"{name} {pct}%")
-    return ", ".join(parts)
+    half = total // 2
+    return ", ".join(
+        f"{name} {(count * 100 + half) // total}%"
+        for name, count in heapq.nlargest(limit, languages.items(), key=itemgetter(1))
+    )
@@ -1,63 +1,83 @@
 from __future__ import annotations
 
+import re
+import threading
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date
+from functools import lru_cache
 from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import quote
 
 import requests
+import soupsieve as sv
 from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
 from tenacity import RetryError
 
 from .config import AppConfig
 from .github_api import (
     GitHubSession,
+    RateLimitError,
+    create_http_session,
+    fetch_repo_bundle,
+    graphql_user_bundle,
+    get_repo_tree,
     guess_username_from_profile,
-    list_directory_contents,
-    list_repo_branches,
     list_user_repos,
     retrieve_file,
-    get_repo_languages,
 )
+from .llm import _MAX_REPO_DOC_CHARS
 from .models import ContributionStats, ProfileContext, RepoDocumentation, RepoMetrics, RepoReport
 
 _DOC_HINTS = {"readme", "contributing", "docs", "documentation", "guide"}
+_DOC_HINT_TUPLE = tuple(_DOC_HINTS)
 _DOC_EXTENSIONS = (".md", ".rst", ".txt")
 _MAX_DOC_BYTES = 120_000
 _MAX_DOC_FILES = 8
+_MAX_FALLBACK_PROBES = 4
+_MAX_DOC_DOWNLOADS = 4
+_CONTRIBUTIONS_CACHE_SECONDS = 600
+# Only the first _MAX_REPO_DOC_CHARS characters reach the prompt; allow four bytes per UTF-8 character.
+_MAX_DOC_READ_BYTES = _MAX_REPO_DOC_CHARS * 4
+_RECT_TAG = re.compile(rb"<rect\b[^>]*>", re.IGNORECASE)
+_DATA_DATE_YEAR = re.compile(rb"""\bdata-date=["'](\d{4})-""")
+_DATA_COUNT = re.compile(rb"""\bdata-count=["'](\d+)["']""")
+_REPO_ITEM_SEL = sv.compile("#user-repositories-list li")
+_REPO_NAME_SEL = sv.compile("h3 a")
+_REPO_DESCRIPTION_SEL = sv.compile("p")
+_REPO_LANGUAGE_SEL = sv.compile("[itemprop='programmingLanguage']")
+_STARGAZERS_SEL = sv.compile("a[href$='/stargazers']")
+_FORKS_SEL = sv.compile("a[href$='/network/members']")
+
+try:
+    import lxml  # type: ignore  # noqa: F401
+
+    _HTML_PARSER = "lxml"
+except ImportError:  # pragma: no cover - optional C parser not installed
+    _HTML_PARSER = "html.parser"
+
+
+@lru_cache(maxsize=1)
+def _raw_session() -> requests.Session:
+    session = create_http_session(urls_expire_after={"github.com/users/*/contributions": _CONTRIBUTIONS_CACHE_SECONDS})
+    session.headers["User-Agent"] = "github-scanner/0.1"
+    session.mount("https://", HTTPAdapter(pool_connections=32, pool_maxsize=64, max_retries=0))
+    return session
 
 
 def collect_profile(profile_url: str, config: AppConfig) -> ProfileContext:
     username = guess_username_from_profile(profile_url)
     session = GitHubSession.create()
-    api_available = True
-    try:
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        contributions_future = executor.submit(_fetch_contributions, username)
         try:
-            repos = list_user_repos(session, username=username, owned_only=config.modes.owned_repos_only)
-        except RetryError as error:
-            root_exc = error.last_attempt.exception() if hasattr(error, "last_attempt") else None
-            message = str(root_exc or error)
-            if root_exc and isinstance(root_exc, requests.HTTPError) and "rate limit" in message.lower():
-                api_available = False
-                repos = _scrape_user_repos(username)
-            elif "rate limit" in message.lower():
-                api_available = False
-                repos = _scrape_user_repos(username)
-            else:
-                raise
-        except requests.HTTPError as error:
-            if "rate limit" in str(error).lower():
-                api_available = False
-                repos = _scrape_user_repos(username)
-            else:
-                raise
-
-        repo_reports = [
-            _build_repo_report(session if api_available else None, repo, config, api_available) for repo in repos
-        ]
-    finally:
-        session.close()
-
-    contributions = _fetch_contributions(username)
+            repo_reports = _collect_repo_reports_graphql(session, username, config) if session.tokens else None
+            if repo_reports is None:
+                repo_reports = _collect_repo_reports_rest(session, username, config)
+        finally:
+            session.close()
+        contributions = contributions_future.result()
 
     return ProfileContext(
         username=username,
@@ -68,24 +88,71 @@ def collect_profile(profile_url: str, config: AppConfig) -> ProfileContext:
     )
 
 
+def _collect_repo_reports_rest(session: GitHubSession, username: str, config: AppConfig) -> List[RepoReport]:
+    api_available = True
+    try:
+        repos = list_user_repos(session, username=username, owned_only=config.modes.owned_repos_only)
+    except RetryError as error:
+        root_exc = error.last_attempt.exception() if hasattr(error, "last_attempt") else None
+        message = str(root_exc or error)
+        if root_exc and isinstance(root_exc, requests.HTTPError) and "rate limit" in message.lower():
+            api_available = False
+            repos = _scrape_user_repos(username)
+        elif "rate limit" in message.lower():
+            api_available = False
+            repos = _scrape_user_repos(username)
+        else:
+            raise
+    except requests.HTTPError as error:
+        if "rate limit" in str(error).lower():
+            api_available = False
+            repos = _scrape_user_repos(username)
+        else:
+            raise
+
+    api_session = session if api_available else None
+    with ThreadPoolExecutor(max_workers=max(1, config.modes.concurrency)) as executor:
+        return list(executor.map(lambda repo: _build_repo_report(api_session, repo, config, api_available), repos))
+
+
+def _collect_repo_reports_graphql(session: GitHubSession, username: str, config: AppConfig) -> Optional[List[RepoReport]]:
+    try:
+        repos = graphql_user_bundle(session, username, owned_only=config.modes.owned_repos_only)
+    except (RetryError, requests.HTTPError):
+        return None
+    with ThreadPoolExecutor(max_workers=max(1, config.modes.concurrency)) as executor:
+        return list(executor.map(lambda repo: _build_graphql_repo_report(session, repo, config), repos))
+
+
+def _build_graphql_repo_report(session: GitHubSession, repo_payload: Dict[str, Any], config: AppConfig) -> RepoReport:
+    metrics = _build_repo_metrics(repo_payload)
+    metrics.languages = repo_payload.get("languages", {})
+    metrics.popular_branches = _select_popular_branches(metrics.default_branch, list(repo_payload.get("branches", [])))
+    prefetched: Dict[str, str] = {}
+    readme = repo_payload.get("readme", "")
+    if readme:
+        prefetched["README.md"] = readme.encode("utf-8")[:_MAX_DOC_READ_BYTES].decode("utf-8", errors="ignore")
+    owner, _, repo_name = metrics.full_name.partition("/")
+    try:
+        tree = get_repo_tree(session, owner, repo_name, metrics.default_branch)
+    except RateLimitError:
+        session.mark_rate_limited()
+        return RepoReport(metrics=metrics, docs=RepoDocumentation(files=prefetched))
+    docs = _collect_documentation(
+        session, metrics.full_name, metrics.default_branch, tree, extended=config.modes.docs_only, prefetched=prefetched
+    )
+    if not docs.files and prefetched:
+        docs.files.update(prefetched)
+    return RepoReport(metrics=metrics, docs=docs)
+
+
 def _build_repo_report(
     session: GitHubSession | None,
     repo_payload: Dict[str, Any],
     config: AppConfig,
     api_available: bool,
 ) -> RepoReport:
-    metrics = RepoMetrics(
-        name=repo_payload.get("name", ""),
-        full_name=repo_payload.get("full_name", ""),
-        html_url=repo_payload.get("html_url", ""),
-        description=repo_payload.get("description"),
-        stars=int(repo_payload.get("stargazers_count", 0)),
-        forks=int(repo_payload.get("forks_count", 0)),
-        open_issues=int(repo_payload.get("open_issues_count", 0)),
-        watchers=int(repo_payload.get("watchers_count", 0)),
-        default_branch=str(repo_payload.get("default_branch", "main")),
-        topics=repo_payload.get("topics", []),
-    )
+    metrics = _build_repo_metrics(repo_payload)
 
     owner, repo_name = metrics.full_name.split("/") if "/" in metrics.full_name else (repo_payload.get("owner", {}).get("login", ""), metrics.name)
 
@@ -93,19 +160,20 @@ def _build_repo_report(
     docs: RepoDocumentation
     if use_api and session is not None:
         try:
-            metrics.languages = get_repo_languages(session, owner, repo_name)
-            branches = list_repo_branches(session, owner, repo_name)
+            metrics.languages, branches, tree = fetch_repo_bundle(session, owner, repo_name, metrics.default_branch)
             metrics.popular_branches = _select_popular_branches(metrics.default_branch, branches)
-            docs = _collect_documentation(session, owner, repo_name, extended=config.modes.docs_only)
+            docs = _collect_documentation(
+                session, metrics.full_name, metrics.default_branch, tree, extended=config.modes.docs_only
+            )
         except RetryError as error:
-            session.rate_limited = True
             if _is_rate_limited_error(error):
+                session.mark_rate_limited()
                 use_api = False
             else:
                 raise
         except requests.HTTPError as error:
             if "rate limit" in str(error).lower():
-                session.rate_limited = True
+                session.mark_rate_limited()
                 use_api = False
             else:
                 raise
@@ -117,32 +185,58 @@ def _build_repo_report(
     return RepoReport(metrics=metrics, docs=docs)
 
 
-def _collect_documentation(session: GitHubSession, owner: str, repo: str, *, extended: bool) -> RepoDocumentation:
+def _build_repo_metrics(repo_payload: Dict[str, Any]) -> RepoMetrics:
+    return RepoMetrics(
+        name=repo_payload.get("name", ""),
+        full_name=repo_payload.get("full_name", ""),
+        html_url=repo_payload.get("html_url", ""),
+        description=repo_payload.get("description"),
+        stars=int(repo_payload.get("stargazers_count", 0)),
+        forks=int(repo_payload.get("forks_count", 0)),
+        open_issues=int(repo_payload.get("open_issues_count", 0)),
+        watchers=int(repo_payload.get("watchers_count", 0)),
+        default_branch=str(repo_payload.get("default_branch", "main")),
+        topics=repo_payload.get("topics", []),
+    )
+
+
+def _collect_documentation(
+    session: GitHubSession,
+    full_name: str,
+    ref: str,
+    tree: List[Dict[str, Any]],
+    *,
+    extended: bool,
+    prefetched: Optional[Dict[str, str]] = None,
+) -> RepoDocumentation:
     documentation = RepoDocumentation()
+    prefetched = prefetched or {}
     max_depth = 2 if extended else 1
-    stack: List[Tuple[str, int]] = [("", 0)]
-    while stack:
-        path, depth = stack.pop()
-        if depth > max_depth or len(documentation.files) >= _MAX_DOC_FILES:
-            continue
+    doc_paths = sorted(
+        (
+            entry["path"]
+            for entry in tree
+            if entry.get("type") == "blob"
+            and entry.get("path", "").count("/") <= max_depth
+            and int(entry.get("size", 0)) <= _MAX_DOC_BYTES
+            and _is_doc_file(entry["path"].rsplit("/", 1)[-1])
+        ),
+        key=lambda path: (path.count("/"), not _looks_like_doc_folder(path.rpartition("/")[0]), path),
+    )[:_MAX_DOC_FILES]
+
+    def download(path: str) -> Tuple[str, Optional[str]]:
+        if path in prefetched:
+            return path, prefetched[path]
+        url = f"https://raw.githubusercontent.com/{full_name}/{quote(ref)}/{quote(path)}"
         try:
-            contents = list_directory_contents(session, owner, repo, path)
-        except requests.HTTPError:
-            continue
-        for node in contents:
-            node_type = node.get("type")
-            name = node.get("name", "")
-            download_url = node.get("download_url")
-            size = int(node.get("size", 0))
-            relative_path = node.get("path", name)
-            if node_type == "dir" and depth < max_depth:
-                if extended or _looks_like_doc_folder(name) or depth == 0:
-                    stack.append((relative_path, depth + 1))
-            elif node_type == "file" and _is_doc_file(name) and download_url and size <= _MAX_DOC_BYTES:
-                try:
-                    documentation.files[relative_path] = retrieve_file(session, download_url)
-                except requests.HTTPError:
-                    continue
+            return path, retrieve_file(session, url, max_bytes=_MAX_DOC_READ_BYTES)
+        except requests.RequestException:
+            return path, None
+
+    with ThreadPoolExecutor(max_workers=_MAX_DOC_DOWNLOADS) as executor:
+        for path, text in executor.map(download, doc_paths):
+            if text is not None:
+                documentation.files[path] = text
     return documentation
 
 
@@ -173,97 +267,166 @@ def _collect_documentation_fallback(full_name: str, default_branch: str, *, exte
                 "docs/setup.md",
             ]
         )
-    for branch in branch_candidates:
-        for path in doc_paths:
-            if len(documentation.files) >= _MAX_DOC_FILES:
-                return documentation
-            url = f"https://raw.githubusercontent.com/{full_name}/{branch}/{path}"
-            try:
-                response = requests.get(url, headers={"User-Agent": "github-scanner/0.1"}, timeout=20)
-            except requests.RequestException:
-                continue
-            if response.status_code != 200:
-                continue
-            text = response.text
-            if len(text) > _MAX_DOC_BYTES:
-                continue
+    probes = [
+        (path, f"https://raw.githubusercontent.com/{full_name}/{branch}/{path}")
+        for branch in branch_candidates
+        for path in doc_paths
+    ]
+    found_paths: set[str] = set()
+    found_lock = threading.Lock()
+    enough = threading.Event()
+
+    def probe(item: Tuple[str, str]) -> Tuple[str, Optional[str]]:
+        path, url = item
+        if enough.is_set():
+            return path, None
+        text = _fetch_raw_text(url)
+        if text is not None:
+            with found_lock:
+                found_paths.add(path)
+                if len(found_paths) >= _MAX_DOC_FILES:
+                    enough.set()
+        return path, text
+
+    with ThreadPoolExecutor(max_workers=_MAX_FALLBACK_PROBES) as executor:
+        results = list(executor.map(probe, probes))
+    for path, text in results:
+        if len(documentation.files) >= _MAX_DOC_FILES:
+            break
+        if text is not None and path not in documentation.files:
             documentation.files[path] = text
     return documentation
 
 
+def _fetch_raw_text(url: str) -> Optional[str]:
+    try:
+        with _raw_session().get(url, timeout=20, stream=True) as response:
+            if response.status_code != 200:
+                return None
+            chunks: List[bytes] = []
+            total = 0
+            for chunk in response.iter_content(chunk_size=8192):
+                total += len(chunk)
+                if total > _MAX_DOC_BYTES:
+                    return None
+                chunks.append(chunk)
+            encoding = response.encoding or "utf-8"
+    except requests.RequestException:
+        return None
+    return b"".join(chunks).decode(encoding, errors="replace")
+
+
+@lru_cache(maxsize=2048)
 def _looks_like_doc_folder(name: str) -> bool:
     lowered = name.lower()
     return any(hint in lowered for hint in _DOC_HINTS)
 
 
+@lru_cache(maxsize=2048)
 def _is_doc_file(name: str) -> bool:
     lowered = name.lower()
-    if any(lowered.startswith(hint) for hint in _DOC_HINTS):
-        return True
-    return lowered.endswith(_DOC_EXTENSIONS)
+    return lowered.startswith(_DOC_HINT_TUPLE) or lowered.endswith(_DOC_EXTENSIONS)
 
 
 def _select_popular_branches(default_branch: str, branches: List[str], limit: int = 3) -> List[str]:
-    if default_branch in branches:
-        branches.remove(default_branch)
-    ordered = [default_branch]
-    ordered.extend(branch for branch in branches if branch != default_branch)
-    return ordered[:limit]
+    return list(dict.fromkeys([default_branch, *branches]))[:limit]
 
 
 def _fetch_contributions(username: str) -> ContributionStats:
     url = f"https://github.com/users/{username}/contributions"
-    response = requests.get(url, headers={"User-Agent": "github-scanner/0.1"}, timeout=30)
+    response = _raw_session().get(url, timeout=30)
     response.raise_for_status()
-    soup = BeautifulSoup(response.text, "html.parser")
-    yearly_totals: Dict[int, int] = defaultdict(int)
-    for node in soup.select("rect[data-date][data-count]"):
-        data_date = node.get("data-date")
-        if not data_date:
+    return ContributionStats(yearly_counts=_extract_yearly_counts(response.content))
+
+
+def _extract_yearly_counts(html: bytes) -> Dict[int, int]:
+    yearly_totals: Dict[bytes, int] = defaultdict(int)
+    for tag in _RECT_TAG.finditer(html):
+        markup = tag.group(0)
+        year_match = _DATA_DATE_YEAR.search(markup)
+        count_match = _DATA_COUNT.search(markup)
+        if not year_match or not count_match:
             continue
-        year = int(data_date.split("-")[0])
-        count = int(node.get("data-count", "0"))
-        yearly_totals[year] += count
-    ordered = dict(sorted(yearly_totals.items()))
-    return ContributionStats(yearly_counts=ordered)
+        count = count_match.group(1)
+        if count == b"0":
+            yearly_totals.setdefault(year_match.group(1), 0)
+        else:
+            yearly_totals[year_match.group(1)] += int(count)
+    return {int(year): total for year, total in sorted(yearly_totals.items())}
 
 
 def _scrape_user_repos(username: str, max_pages: int = 2) -> List[Dict[str, Any]]:
+    api_repos = _list_repos_unauthenticated(username)
+    if api_repos is not None:
+        return api_repos
     repos: List[Dict[str, Any]] = []
-    headers = {"User-Agent": "github-scanner/0.1"}
     for page in range(1, max_pages + 1):
         url = f"https://github.com/{username}?tab=repositories&type=source&sort=updated&page={page}"
         try:
-            response = requests.get(url, headers=headers, timeout=30)
+            response = _raw_session().get(url, timeout=30)
             response.raise_for_status()
         except requests.RequestException:
             break
-        soup = BeautifulSoup(response.text, "html.parser")
-        container = soup.select_one("#user-repositories-list")
-        if not container:
+        page_repos = _parse_repo_listing(username, response.content)
+        if not page_repos:
             break
-        items = container.select("li")
-        if not items:
+        repos.extend(page_repos)
+        if len(repos) >= 30:
             break
-        for item in items:
-            name_tag = item.select_one("h3 a")
-            if not name_tag:
-                continue
-            name = name_tag.text.strip()
-            if not name:
+    return repos
+
+
+def _list_repos_unauthenticated(username: str, max_pages: int = 10) -> Optional[List[Dict[str, Any]]]:
+    repos: List[Dict[str, Any]] = []
+    url: Optional[str] = f"https://api.github.com/users/{username}/repos"
+    params: Optional[Dict[str, str]] = {"per_page": "100", "sort": "updated", "type": "owner"}
+    for page in range(max_pages):
+        if url is None:
+            break
+        try:
+            response = _raw_session().get(
+                url, params=params, headers={"Accept": "application/vnd.github+json"}, timeout=30
+            )
+            payload = response.json() if response.status_code == 200 else None
+        except (requests.RequestException, ValueError):
+            payload = None
+        if not isinstance(payload, list):
+            if page == 0:
+                return None
+            break
+        for repo in payload:
+            # Match the HTML scrape's type=source listing, which leaves forks out.
+            if repo.get("fork"):
                 continue
-            full_name = f"{username}/{name}"
-            html_url = f"https://github.com/{full_name}"
-            description_tag = item.select_one("p")
-            description = description_tag.text.strip() if description_tag else None
-            language_tag = item.select_one("[itemprop='programmingLanguage']")
-            primary_language = language_tag.text.strip() if language_tag else ""
-            stars = _extract_count_from_repo_item(item, "stargazers")
-            forks = _extract_count_from_repo_item(item, "network/members")
-            repo_payload = {
+            language = repo.get("language")
+            repo.setdefault("languages", {language: 1} if language else {})
+            repos.append(repo)
+        url, params = response.links.get("next", {}).get("url"), None
+    return repos
+
+
+def _parse_repo_listing(username: str, html: bytes) -> List[Dict[str, Any]]:
+    soup = BeautifulSoup(html, _HTML_PARSER)
+    repos: List[Dict[str, Any]] = []
+    for item in _REPO_ITEM_SEL.select(soup):
+        name_tag = _REPO_NAME_SEL.select_one(item)
+        if not name_tag:
+            continue
+        name = name_tag.text.strip()
+        if not name:
+            continue
+        full_name = f"{username}/{name}"
+        description_tag = _REPO_DESCRIPTION_SEL.select_one(item)
+        description = description_tag.text.strip() if description_tag else None
+        language_tag = _REPO_LANGUAGE_SEL.select_one(item)
+        primary_language = language_tag.text.strip() if language_tag else ""
+        stars = _extract_count_from_repo_item(item, _STARGAZERS_SEL)
+        forks = _extract_count_from_repo_item(item, _FORKS_SEL)
+        repos.append(
+            {
                 "name": name,
                 "full_name": full_name,
-                "html_url": html_url,
+                "html_url": f"https://github.com/{full_name}",
                 "description": description,
                 "stargazers_count": stars,
                 "forks_count": forks,
@@ -274,14 +437,12 @@ def _scrape_user_repos(username: str, max_pages: int = 2) -> List[Dict[str, Any]
                 "languages": {primary_language: 1} if primary_language else {},
                 "popular_branches": ["main"],
             }
-            repos.append(repo_payload)
-        if len(repos) >= 30:
-            break
+        )
     return repos
 
 
-def _extract_count_from_repo_item(item: Any, suffix: str) -> int:
-    link = item.select_one(f"a[href$='/{suffix}']")
+def _extract_count_from_repo_item(item: Any, selector: sv.SoupSieve) -> int:
+    link = selector.select_one(item)
     if not link or not link.text:
         return 0
     text = link.text.strip().lower().replace(",", "")
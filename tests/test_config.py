@@ -14,7 +14,9 @@ class ConfigTests(unittest.TestCase):
         self.assertIsInstance(config, AppConfig)
         self.assertTrue(config.modes.docs_only)
         self.assertTrue(config.modes.owned_repos_only)
+        self.assertEqual(config.modes.concurrency, 16)
         self.assertEqual(config.llm.provider, "openai")
+        self.assertEqual(config.llm.cache_path, Path(".cache/llm_responses.sqlite3"))
 
     def test_load_custom_config(self) -> None:
         with tempfile.TemporaryDirectory() as tmp:
@@ -24,12 +26,14 @@ class ConfigTests(unittest.TestCase):
                 modes:
                   docs_only: false
                   owned_repos_only: false
+                  concurrency: 4
                 llm:
                   provider: openai
                   model: gpt-4o
                   temperature: 0.5
                   max_output_tokens: 800
                   api_key_env: ALT_KEY
+                  cache_path: null
                 output:
                   directory: custom_reports
                   format: markdown
@@ -41,8 +45,10 @@ class ConfigTests(unittest.TestCase):
 
         self.assertFalse(config.modes.docs_only)
         self.assertFalse(config.modes.owned_repos_only)
+        self.assertEqual(config.modes.concurrency, 4)
         self.assertEqual(config.llm.model, "gpt-4o")
         self.assertEqual(config.llm.api_key_env, "ALT_KEY")
+        self.assertIsNone(config.llm.cache_path)
         self.assertEqual(config.output.directory, Path("custom_reports"))
 
 
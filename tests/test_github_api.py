@@ -0,0 +1,301 @@
+from __future__ import annotations
+
+import gzip
+import io
+import json
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+from unittest import mock
+
+import requests
+import urllib3
+from requests.adapters import BaseAdapter
+
+from github_scanner import github_api
+
+try:
+    import requests_cache  # noqa: F401
+except ImportError:  # pragma: no cover - optional extra not installed
+    requests_cache = None
+
+
+class _GzipHandler(BaseHTTPRequestHandler):
+    bodies: Dict[str, bytes] = {
+        "/doc.md": gzip.compress("héllo wörld ".encode("utf-8") * 5000),
+        "/broken.md": b"definitely not gzip",
+    }
+
+    def do_GET(self) -> None:
+        body = self.bodies.get(self.path)
+        if body is None:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/markdown; charset=utf-8")
+        self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args) -> None:
+        return None
+
+
+class _CountingBody(io.BytesIO):
+    def __init__(self, data: bytes) -> None:
+        super().__init__(data)
+        self.bytes_read = 0
+
+    def read(self, size: int = -1) -> bytes:
+        chunk = super().read(size)
+        self.bytes_read += len(chunk)
+        return chunk
+
+
+class _LargeFileAdapter(BaseAdapter):
+    def __init__(self, size: int) -> None:
+        super().__init__()
+        self.size = size
+        self.bodies: List[_CountingBody] = []
+
+    def send(self, request: requests.PreparedRequest, **kwargs: Any) -> requests.Response:
+        body = _CountingBody(b"x" * self.size)
+        self.bodies.append(body)
+        raw = urllib3.HTTPResponse(
+            body=body, headers={"Content-Type": "text/plain"}, status=200, preload_content=False
+        )
+        response = requests.Response()
+        response.status_code = 200
+        response.headers = requests.structures.CaseInsensitiveDict(raw.headers)
+        response.raw = raw
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        return response
+
+    def close(self) -> None:
+        return None
+
+
+_Route = Union[Tuple[Any, ...], Callable[[requests.PreparedRequest], Tuple[Any, ...]]]
+
+
+class _JsonRoutesAdapter(BaseAdapter):
+    def __init__(self, routes: Dict[str, _Route]) -> None:
+        super().__init__()
+        self.routes = routes
+        self.requests: List[requests.PreparedRequest] = []
+
+    def send(self, request: requests.PreparedRequest, **kwargs: Any) -> requests.Response:
+        self.requests.append(request)
+        path = request.path_url.split("?", 1)[0]
+        route = self.routes.get(path, (404, {"message": "Not Found"}))
+        status, payload, *extra_headers = route(request) if callable(route) else route
+        response = requests.Response()
+        response.status_code = status
+        response.headers = requests.structures.CaseInsensitiveDict({"Content-Type": "application/json"})
+        for headers in extra_headers:
+            response.headers.update(headers)
+        response._content = json.dumps(payload).encode("utf-8")
+        response.url = request.url
+        response.request = request
+        return response
+
+    def close(self) -> None:
+        return None
+
+
+class _LocalGzipServerTestCase(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), _GzipHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_port}"
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.server.shutdown()
+        cls.server.server_close()
+
+
+def _page(names: List[str], has_next: bool, cursor: Optional[str] = None) -> Dict[str, Any]:
+    return {
+        "user": {
+            "repositories": {
+                "pageInfo": {"hasNextPage": has_next, "endCursor": cursor},
+                "nodes": [{"name": name, "nameWithOwner": f"octocat/{name}"} for name in names],
+            }
+        }
+    }
+
+
+class GraphQLUserBundleTests(unittest.TestCase):
+    def test_follows_cursor_until_last_page(self) -> None:
+        pages = [_page(["one", "two"], True, "abc"), _page(["three"], False)]
+        seen_cursors = []
+
+        def fake_post(session: github_api.GitHubSession, query: str, variables: Dict[str, Any]) -> Dict[str, Any]:
+            seen_cursors.append(variables["cursor"])
+            return pages[len(seen_cursors) - 1]
+
+        with mock.patch.object(github_api, "_post_graphql", side_effect=fake_post):
+            repos = github_api.graphql_user_bundle(mock.Mock(), "octocat")
+
+        self.assertEqual([repo["name"] for repo in repos], ["one", "two", "three"])
+        self.assertEqual(seen_cursors, [None, "abc"])
+        self.assertEqual(repos[0]["default_branch"], "main")
+
+    def test_payload_matches_rest_issue_count_and_languages(self) -> None:
+        node = {
+            "name": "hello",
+            "nameWithOwner": "octocat/hello",
+            "issues": {"totalCount": 3},
+            "pullRequests": {"totalCount": 2},
+            "languages": {"edges": [{"size": 10 * index, "node": {"name": f"Lang{index}"}} for index in range(1, 13)]},
+        }
+        payload = github_api._graphql_repo_payload(node)
+        self.assertEqual(payload["open_issues_count"], 5)
+        self.assertEqual(len(payload["languages"]), 12)
+        self.assertIn("languages(first: 100", github_api._USER_REPOS_QUERY)
+
+    def test_missing_user_raises(self) -> None:
+        with mock.patch.object(github_api, "_post_graphql", return_value={"user": None}):
+            with self.assertRaises(github_api.GraphQLQueryError):
+                github_api.graphql_user_bundle(mock.Mock(), "ghost")
+
+    def test_query_errors_are_not_retried(self) -> None:
+        response = mock.Mock(status_code=200, text="")
+        response.json.return_value = {"errors": [{"type": "NOT_FOUND", "message": "Could not resolve to a User"}]}
+        session = github_api.GitHubSession(http=mock.Mock())
+        session.http.post.return_value = response
+        with mock.patch.object(github_api._post_graphql.retry, "sleep") as sleep:
+            with self.assertRaises(github_api.GraphQLQueryError):
+                github_api.graphql_user_bundle(session, "ghost")
+        self.assertEqual(session.http.post.call_count, 1)
+        sleep.assert_not_called()
+
+
+class RetrieveFileTests(_LocalGzipServerTestCase):
+    def test_reads_decoded_prefix_of_gzip_body(self) -> None:
+        session = github_api.GitHubSession(http=requests.Session())
+        text = github_api.retrieve_file(session, f"{self.base_url}/doc.md", max_bytes=20)
+        self.assertEqual(text, "héllo wörld héllo")
+
+    def test_decoding_failures_stay_request_exceptions(self) -> None:
+        session = github_api.GitHubSession(http=requests.Session())
+        with self.assertRaises(requests.RequestException):
+            github_api.retrieve_file(session, f"{self.base_url}/broken.md", max_bytes=20)
+
+
+def _rate_limited_unless(allowed_token: str) -> Callable[[requests.PreparedRequest], Tuple[int, Any]]:
+    def route(request: requests.PreparedRequest) -> Tuple[int, Any]:
+        if request.headers.get("Authorization") == f"Bearer {allowed_token}":
+            return 200, {"login": "octocat"}
+        return 403, {"message": "API rate limit exceeded for token"}
+
+    return route
+
+
+class ListUserReposTests(unittest.TestCase):
+    def test_follows_link_header_to_the_last_page(self) -> None:
+        next_url = "https://api.github.com/user/583231/repos?per_page=100&type=owner&sort=pushed&page=2"
+        adapter = _JsonRoutesAdapter(
+            {
+                "/users/octocat/repos": (200, [{"name": "one"}, {"name": "two"}], {"Link": f'<{next_url}>; rel="next"'}),
+                "/user/583231/repos": (200, [{"name": "three"}]),
+            }
+        )
+        http = requests.Session()
+        http.mount("https://api.github.com/", adapter)
+        repos = github_api.list_user_repos(github_api.GitHubSession(http=http), "octocat")
+
+        self.assertEqual([repo["name"] for repo in repos], ["one", "two", "three"])
+        self.assertEqual(len(adapter.requests), 2)
+        self.assertEqual(adapter.requests[1].url, next_url)
+
+
+class TokenRotationTests(unittest.TestCase):
+    def _session(self, tokens: List[str], allowed_token: str) -> Tuple[github_api.GitHubSession, _JsonRoutesAdapter]:
+        adapter = _JsonRoutesAdapter({"/users/octocat": _rate_limited_unless(allowed_token)})
+        http = requests.Session()
+        http.mount("https://api.github.com/", adapter)
+        return github_api.GitHubSession(http=http, tokens=tokens), adapter
+
+    def test_rate_limited_token_is_swapped_for_the_next_one(self) -> None:
+        session, adapter = self._session(["token-a", "token-b"], allowed_token="token-b")
+        response = github_api._get(session, "/users/octocat")
+        self.assertEqual(response.json(), {"login": "octocat"})
+        self.assertEqual(
+            [request.headers["Authorization"] for request in adapter.requests],
+            ["Bearer token-a", "Bearer token-b"],
+        )
+        self.assertFalse(session.rate_limited)
+
+    def test_raises_once_every_token_is_refused(self) -> None:
+        session, adapter = self._session(["token-a", "token-b", "token-c"], allowed_token="none")
+        with mock.patch.object(github_api._get.retry, "sleep") as sleep:
+            with self.assertRaises(github_api.RateLimitError):
+                github_api._get(session, "/users/octocat")
+        self.assertEqual(len(adapter.requests), 3)
+        sleep.assert_not_called()
+        self.assertTrue(session.rate_limited)
+
+    def test_repr_hides_tokens(self) -> None:
+        session = github_api.GitHubSession(http=requests.Session(), tokens=["ghp_secret"])
+        self.assertNotIn("ghp_secret", repr(session))
+
+
+class FetchRepoBundleTests(unittest.TestCase):
+    def test_empty_repository_has_no_tree(self) -> None:
+        http = requests.Session()
+        http.mount(
+            "https://api.github.com/",
+            _JsonRoutesAdapter(
+                {
+                    "/repos/octocat/empty/languages": (200, {}),
+                    "/repos/octocat/empty/branches": (200, []),
+                    "/repos/octocat/empty/git/trees/main": (409, {"message": "Git Repository is empty."}),
+                }
+            ),
+        )
+        session = github_api.GitHubSession(http=http)
+        with mock.patch.object(github_api._get.retry, "sleep"):
+            languages, branches, tree = github_api.fetch_repo_bundle(session, "octocat", "empty", "main")
+        self.assertEqual((languages, branches, tree), ({}, [], []))
+        self.assertFalse(session.rate_limited)
+
+
+@unittest.skipIf(requests_cache is None, "requests-cache not installed")
+class CachedSessionTests(_LocalGzipServerTestCase):
+    def setUp(self) -> None:
+        cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(cache_dir.cleanup)
+        patcher = mock.patch.object(github_api, "HTTP_CACHE_NAME", f"{cache_dir.name}/http")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.http = github_api.create_http_session()
+        self.addCleanup(self.http.close)
+
+    def test_retrieve_file_reads_gzip_before_and_after_caching(self) -> None:
+        session = github_api.GitHubSession(http=self.http)
+        for _ in range(2):
+            text = github_api.retrieve_file(session, f"{self.base_url}/doc.md", max_bytes=20)
+            self.assertEqual(text, "héllo wörld héllo")
+
+    def test_raw_downloads_bypass_the_cache(self) -> None:
+        adapter = _LargeFileAdapter(size=1_000_000)
+        self.http.mount("https://raw.githubusercontent.com/", adapter)
+        session = github_api.GitHubSession(http=self.http)
+        url = "https://raw.githubusercontent.com/octocat/hello/main/README.md"
+        for _ in range(2):
+            self.assertEqual(github_api.retrieve_file(session, url, max_bytes=100), "x" * 100)
+        self.assertEqual(len(adapter.bodies), 2)
+        self.assertTrue(all(body.bytes_read < adapter.size for body in adapter.bodies))
+        self.assertEqual(list(self.http.cache.responses.keys()), [])
+
+
+if __name__ == "__main__":  # pragma: no cover
+    unittest.main()
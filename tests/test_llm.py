@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import json
+import sys
+import tempfile
+import types
+import unittest
+from datetime import date
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from unittest import mock
+
+from github_scanner.config import AppConfig
+from github_scanner.llm import (
+    _normalise_whitespace,
+    _parse_batch_summaries,
+    _post_process_spotlight,
+    _select_sentences,
+    enrich_repo_summaries,
+)
+from github_scanner.models import ContributionStats, ProfileContext, RepoDocumentation, RepoMetrics, RepoReport
+
+
+class _FakeResponses:
+    def __init__(self, batch_payload: Dict[str, Any], batch_status: str = "completed") -> None:
+        self.batch_payload = batch_payload
+        self.batch_status = batch_status
+        self.calls: List[Dict[str, Any]] = []
+
+    async def create(self, **kwargs: Any) -> types.SimpleNamespace:
+        self.calls.append(kwargs)
+        if "text" in kwargs:
+            text, status = json.dumps(self.batch_payload), self.batch_status
+        else:
+            repo_line = kwargs["input"][1]["content"].splitlines()[0]
+            text, status = f"Per-repo summary for {repo_line.split(': ', 1)[-1]}.", "completed"
+        content = types.SimpleNamespace(text=text)
+        return types.SimpleNamespace(status=status, output=[types.SimpleNamespace(content=[content])])
+
+
+class _FakeAsyncOpenAI:
+    responses: Optional[_FakeResponses] = None
+
+    def __init__(self, **kwargs: Any) -> None:
+        pass
+
+    async def __aenter__(self) -> "_FakeAsyncOpenAI":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        return None
+
+
+def _make_context(names: List[str]) -> ProfileContext:
+    repos = [
+        RepoReport(
+            metrics=RepoMetrics(
+                name=name,
+                full_name=f"octocat/{name}",
+                html_url=f"https://github.com/octocat/{name}",
+                description=f"{name} description",
+                stars=1,
+                forks=0,
+                open_issues=0,
+                watchers=1,
+                default_branch="main",
+            ),
+            docs=RepoDocumentation(),
+        )
+        for name in names
+    ]
+    return ProfileContext(
+        username="octocat",
+        profile_url="https://github.com/octocat",
+        contributions=ContributionStats(yearly_counts={}),
+        repos=repos,
+        generated_at=date(2024, 1, 1),
+    )
+
+
+class SpotlightPostProcessTests(unittest.TestCase):
+    def test_drops_banned_phrases_and_markdown(self) -> None:
+        text = "# Heading\n- bullet\nBuilds **data** pipelines in Python. An exciting developer to watch! Ships CLI tools."
+        self.assertEqual(_post_process_spotlight(text), "Builds data pipelines in Python. Ships CLI tools.")
+
+    def test_strips_trailing_exclamation(self) -> None:
+        self.assertEqual(_post_process_spotlight("Maintains a Rust parser!"), "Maintains a Rust parser")
+
+    def test_removes_non_ascii_characters(self) -> None:
+        self.assertEqual(_post_process_spotlight("Builds caf\u00e9 tooling \U0001F680."), "Builds caf tooling .")
+
+
+class NormaliseWhitespaceTests(unittest.TestCase):
+    def test_collapses_mixed_whitespace(self) -> None:
+        self.assertEqual(_normalise_whitespace("  Fast\t\tparser\n\n for   YAML \r\n"), "Fast parser for YAML")
+        self.assertEqual(_normalise_whitespace(" \n\t "), "")
+
+
+class SelectSentencesTests(unittest.TestCase):
+    def test_limits_sentence_count(self) -> None:
+        text = "First sentence. Second one! Third? Fourth."
+        self.assertEqual(_select_sentences(text, max_sentences=2, max_chars=500), "First sentence. Second one!")
+        self.assertEqual(_select_sentences(text, max_sentences=10, max_chars=500), text)
+
+    def test_stops_once_character_budget_is_reached(self) -> None:
+        text = "A fairly long opening sentence. Short. Another."
+        self.assertEqual(_select_sentences(text, max_sentences=3, max_chars=10), "A fairly long opening sentence.")
+
+
+
+class BatchSummaryParsingTests(unittest.TestCase):
+    def test_keeps_only_string_summaries(self) -> None:
+        text = json.dumps({"octocat/a": "Parses YAML.", "octocat/b": 3, "octocat/c": None})
+        self.assertEqual(_parse_batch_summaries(text), {"octocat/a": "Parses YAML."})
+
+    def test_rejects_invalid_or_non_object_json(self) -> None:
+        self.assertEqual(_parse_batch_summaries("not json"), {})
+        self.assertEqual(_parse_batch_summaries(json.dumps(["octocat/a", "Parses YAML."])), {})
+
+
+class EnrichRepoSummariesTests(unittest.TestCase):
+    def setUp(self) -> None:
+        cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(cache_dir.cleanup)
+        self.config = AppConfig()
+        self.config.llm.cache_path = Path(cache_dir.name) / "llm.sqlite3"
+        env = mock.patch.dict("os.environ", {self.config.llm.api_key_env: "sk-test"})
+        env.start()
+        self.addCleanup(env.stop)
+
+    def _run(self, context: ProfileContext, responses: _FakeResponses) -> None:
+        fake_openai = types.ModuleType("openai")
+        fake_openai.AsyncOpenAI = type("AsyncOpenAI", (_FakeAsyncOpenAI,), {"responses": responses})
+        with mock.patch.dict(sys.modules, {"openai": fake_openai}):
+            enrich_repo_summaries(context, self.config)
+
+    def test_batch_summaries_with_per_repo_fallback_and_cache(self) -> None:
+        batch = {"octocat/alpha": "Alpha parses logs.", "octocat/beta": "Beta renders charts."}
+        responses = _FakeResponses(batch)
+        context = _make_context(["alpha", "beta", "gamma"])
+        self._run(context, responses)
+
+        self.assertEqual(
+            [report.summary for report in context.repos],
+            ["Alpha parses logs.", "Beta renders charts.", "Per-repo summary for octocat/gamma."],
+        )
+        self.assertEqual(len(responses.calls), 2)
+        self.assertIn("text", responses.calls[0])
+        self.assertNotIn("text", responses.calls[1])
+
+        rerun_responses = _FakeResponses(batch)
+        rerun_context = _make_context(["alpha", "beta", "gamma"])
+        self._run(rerun_context, rerun_responses)
+        self.assertEqual(rerun_responses.calls, [])
+        self.assertEqual(
+            [report.summary for report in rerun_context.repos],
+            [report.summary for report in context.repos],
+        )
+
+    def test_incomplete_batch_falls_back_to_per_repo_calls(self) -> None:
+        responses = _FakeResponses({"octocat/alpha": "Alpha parses logs."}, batch_status="incomplete")
+        context = _make_context(["alpha", "beta"])
+        self._run(context, responses)
+        self.assertEqual(len(responses.calls), 3)
+        self.assertEqual(
+            [report.summary for report in context.repos],
+            ["Per-repo summary for octocat/alpha.", "Per-repo summary for octocat/beta."],
+        )
+
+    def test_single_repository_skips_the_batch_call(self) -> None:
+        responses = _FakeResponses({})
+        context = _make_context(["alpha"])
+        self._run(context, responses)
+        self.assertEqual(len(responses.calls), 1)
+        self.assertNotIn("text", responses.calls[0])
+        self.assertEqual(context.repos[0].summary, "Per-repo summary for octocat/alpha.")
+
+
+if __name__ == "__main__":  # pragma: no cover
+    unittest.main()
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from github_scanner.llm_cache import SQLiteLLMCache, make_cache_key
+
+
+class LLMCacheTests(unittest.TestCase):
+    def test_cache_key_depends_on_model_and_temperature(self) -> None:
+        messages = [{"role": "user", "content": "Summarise octocat/hello-world"}]
+        key = make_cache_key("gpt-4o-mini", 0.2, messages)
+        self.assertEqual(key, make_cache_key("gpt-4o-mini", 0.2, list(messages)))
+        self.assertNotEqual(key, make_cache_key("gpt-4o", 0.2, messages))
+        self.assertNotEqual(key, make_cache_key("gpt-4o-mini", 0.5, messages))
+
+    def test_get_or_set_persists_between_instances(self) -> None:
+        calls: list[str] = []
+
+        def compute() -> str:
+            calls.append("called")
+            return "A concise summary."
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "nested" / "llm.sqlite3"
+            cache = SQLiteLLMCache(path)
+            self.assertEqual(cache.get_or_set("key", compute), "A concise summary.")
+            cache.close()
+
+            reopened = SQLiteLLMCache(path)
+            self.assertEqual(reopened.get_or_set("key", compute), "A concise summary.")
+            self.assertIsNone(reopened.get("missing"))
+            reopened.close()
+
+        self.assertEqual(calls, ["called"])
+
+
+if __name__ == "__main__":  # pragma: no cover
+    unittest.main()
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import unittest
+from datetime import date
+
+from github_scanner.models import ContributionStats, ProfileContext, RepoDocumentation, RepoMetrics, RepoReport
+
+
+class ModelSlotsTests(unittest.TestCase):
+    def test_per_repo_models_use_slots(self) -> None:
+        metrics = RepoMetrics(
+            name="hello-world",
+            full_name="octocat/hello-world",
+            html_url="https://github.com/octocat/hello-world",
+            description=None,
+            stars=0,
+            forks=0,
+            open_issues=0,
+            watchers=0,
+            default_branch="main",
+        )
+        instances = [
+            metrics,
+            RepoDocumentation(),
+            RepoReport(metrics=metrics, docs=RepoDocumentation()),
+            ContributionStats(yearly_counts={}),
+            ProfileContext(
+                username="octocat",
+                profile_url="https://github.com/octocat",
+                contributions=ContributionStats(yearly_counts={}),
+                repos=[],
+                generated_at=date(2024, 1, 1),
+            ),
+        ]
+        for instance in instances:
+            with self.subTest(model=type(instance).__name__):
+                self.assertFalse(hasattr(instance, "__dict__"))
+                with self.assertRaises(AttributeError):
+                    instance.unexpected = True  # type: ignore[attr-defined]
+
+    def test_profile_context_caches_iso_date(self) -> None:
+        context = ProfileContext(
+            username="octocat",
+            profile_url="https://github.com/octocat",
+            contributions=ContributionStats(yearly_counts={}),
+            repos=[],
+            generated_at=date(2024, 1, 1),
+        )
+        self.assertEqual(context.generated_at_iso, "2024-01-01")
+
+    def test_default_factories_are_not_shared(self) -> None:
+        first = RepoDocumentation()
+        second = RepoDocumentation()
+        first.files["README.md"] = "text"
+        self.assertEqual(second.files, {})
+
+
+if __name__ == "__main__":  # pragma: no cover
+    unittest.main()
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import unittest
+from datetime import date
+
+from github_scanner.config import AppConfig
+from github_scanner.models import ContributionStats, ProfileContext, RepoDocumentation, RepoMetrics, RepoReport
+from github_scanner.report import _format_language_summary, _render_markdown
+
+
+def _make_context() -> ProfileContext:
+    metrics = RepoMetrics(
+        name="hello-world",
+        full_name="octocat/hello-world",
+        html_url="https://github.com/octocat/hello-world",
+        description="Example repository",
+        stars=12,
+        forks=3,
+        open_issues=1,
+        watchers=12,
+        default_branch="main",
+        languages={"Python": 750, "Shell": 250},
+        topics=["cli", "demo"],
+        popular_branches=["main", "dev", "dev"],
+    )
+    report = RepoReport(metrics=metrics, docs=RepoDocumentation(), summary="Prints a greeting.")
+    return ProfileContext(
+        username="octocat",
+        profile_url="https://github.com/octocat",
+        contributions=ContributionStats(yearly_counts={2023: 40, 2024: 55}),
+        repos=[report],
+        generated_at=date(2024, 5, 1),
+    )
+
+
+class RenderMarkdownTests(unittest.TestCase):
+    def test_renders_repo_table(self) -> None:
+        markdown = _render_markdown(_make_context(), " Builds CLI tools. ", AppConfig())
+        expected = "\n".join(
+            [
+                "# GitHub Profile Summary: octocat",
+                "",
+                "Generated on: 2024-05-01",
+                "Profile: https://github.com/octocat",
+                "",
+                "Auto Generated profile readme via [GHProfScanner](https://github.com/MarcoBetti1/GHProfScanner)",
+                "",
+                "## Spotlight",
+                "Builds CLI tools.",
+                "",
+                "## Contribution Stats",
+                "- 2023: 40 contributions",
+                "- 2024: 55 contributions",
+                "",
+                "## Public Repositories",
+                "### hello-world",
+                "Prints a greeting.",
+                "",
+                "| Field | Details |",
+                "| --- | --- |",
+                "| Repository | octocat/hello-world |",
+                "| Link | https://github.com/octocat/hello-world |",
+                "| Stats | stars 12, forks 3, issues 1, watchers 12 |",
+                "| Tech stack | Python 75%, Shell 25% |",
+                "| Domains | cli, demo |",
+                "| Branches | main, dev |",
+                "",
+            ]
+        )
+        self.assertEqual(markdown, expected)
+
+    def test_renders_inline_link_without_tables(self) -> None:
+        config = AppConfig()
+        config.output.show_repo_tables = False
+        markdown = _render_markdown(_make_context(), "Builds CLI tools.", config)
+        self.assertIn("### hello-world\nPrints a greeting. Repository: https://github.com/octocat/hello-world\n", markdown)
+        self.assertNotIn("| Field | Details |", markdown)
+
+    def test_renders_placeholder_without_repositories(self) -> None:
+        context = _make_context()
+        context.repos = []
+        markdown = _render_markdown(context, "Builds CLI tools.", AppConfig())
+        self.assertTrue(markdown.endswith("## Public Repositories\nNo repositories found under the current mode settings."))
+
+
+class LanguageSummaryTests(unittest.TestCase):
+    def test_keeps_largest_languages_with_rounded_shares(self) -> None:
+        languages = {"Shell": 1, "Python": 6, "Go": 2, "C": 1, "Makefile": 1}
+        self.assertEqual(_format_language_summary(languages), "Python 55%, Go 18%, Shell 9%, C 9%")
+
+    def test_empty_or_zero_totals_render_nothing(self) -> None:
+        self.assertEqual(_format_language_summary({}), "")
+        self.assertEqual(_format_language_summary({"Python": 0}), "")
+
+
+if __name__ == "__main__":  # pragma: no cover
+    unittest.main()
@@ -0,0 +1,384 @@
+from __future__ import annotations
+
+import gzip
+import io
+import json
+import threading
+import unittest
+from typing import Any, Callable, Dict, List, Tuple
+from unittest import mock
+
+import requests
+import urllib3
+from requests.adapters import BaseAdapter
+
+from github_scanner import scraper
+from github_scanner.config import AppConfig
+from github_scanner import github_api
+from github_scanner.github_api import GitHubSession, RateLimitError
+
+_CONTRIBUTIONS_HTML = """
+<html><body><svg>
+<rect class="day" data-date="2023-12-30" data-count="2" data-level="1"></rect>
+<rect class="day" data-date="2023-12-31" data-count="0" data-level="0"></rect>
+<rect class="day" data-date="2024-01-01" data-count="5" data-level="2"></rect>
+<rect class="day" data-count="3" data-date="2024-01-02" data-level="1"></rect>
+<rect class="legend" data-level="0"></rect>
+</svg></body></html>
+"""
+
+_REPOSITORIES_HTML = """
+<html><body>
+<div id="user-repositories-list"><ul>
+<li>
+  <h3><a href="/octocat/hello-world"> hello-world </a></h3>
+  <p> My first repository </p>
+  <span itemprop="programmingLanguage">Python</span>
+  <a href="/octocat/hello-world/stargazers"> 1.2k </a>
+  <a href="/octocat/hello-world/network/members"> 34 </a>
+</li>
+<li>
+  <h3><a href="/octocat/dotfiles">dotfiles</a></h3>
+</li>
+</ul></div>
+</body></html>
+"""
+
+
+class _FakeResponse:
+    def __init__(self, text: str, status_code: int = 200, next_url: str = "") -> None:
+        self.text = text
+        self.content = text.encode("utf-8")
+        self.status_code = status_code
+        self.links = {"next": {"url": next_url}} if next_url else {}
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise scraper.requests.HTTPError(f"{self.status_code} error")
+
+    encoding = "utf-8"
+
+    def json(self):
+        return json.loads(self.text)
+
+    def iter_content(self, chunk_size: int = 1):
+        for start in range(0, len(self.content), chunk_size):
+            yield self.content[start : start + chunk_size]
+
+    def __enter__(self) -> "_FakeResponse":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        return None
+
+
+class ContributionParsingTests(unittest.TestCase):
+    def test_sums_counts_per_year(self) -> None:
+        with mock.patch.object(scraper, "_raw_session") as raw_session:
+            raw_session.return_value.get.return_value = _FakeResponse(_CONTRIBUTIONS_HTML)
+            stats = scraper._fetch_contributions("octocat")
+        self.assertEqual(stats.yearly_counts, {2023: 2, 2024: 8})
+        self.assertEqual(list(stats.yearly_counts), [2023, 2024])
+
+    def test_keeps_years_without_contributions(self) -> None:
+        html = b'<rect data-date="2022-06-01" data-count="0"></rect><rect data-date="2023-01-01" data-count="4"></rect>'
+        self.assertEqual(scraper._extract_yearly_counts(html), {2022: 0, 2023: 4})
+
+
+class RepositoryListScrapingTests(unittest.TestCase):
+    def test_parses_repository_listing(self) -> None:
+        pages = [
+            _FakeResponse('{"message": "API rate limit exceeded"}', status_code=403),
+            _FakeResponse(_REPOSITORIES_HTML),
+            _FakeResponse("<html></html>"),
+        ]
+        with mock.patch.object(scraper, "_raw_session") as raw_session:
+            raw_session.return_value.get.side_effect = pages
+            repos = scraper._scrape_user_repos("octocat")
+        self.assertEqual([repo["full_name"] for repo in repos], ["octocat/hello-world", "octocat/dotfiles"])
+        first = repos[0]
+        self.assertEqual(first["description"], "My first repository")
+        self.assertEqual(first["stargazers_count"], 1200)
+        self.assertEqual(first["forks_count"], 34)
+        self.assertEqual(first["languages"], {"Python": 1})
+        self.assertIsNone(repos[1]["description"])
+
+    def test_prefers_unauthenticated_api_listing(self) -> None:
+        first_page = [
+            {"name": "hello-world", "full_name": "octocat/hello-world", "language": "Python", "fork": False},
+            {"name": "linux", "full_name": "octocat/linux", "language": "C", "fork": True},
+        ]
+        second_page = [{"name": "dotfiles", "full_name": "octocat/dotfiles", "language": None, "fork": False}]
+        pages = [
+            _FakeResponse(json.dumps(first_page), next_url="https://api.github.com/user/1/repos?page=2"),
+            _FakeResponse(json.dumps(second_page)),
+        ]
+        with mock.patch.object(scraper, "_raw_session") as raw_session:
+            raw_session.return_value.get.side_effect = pages
+            repos = scraper._scrape_user_repos("octocat")
+        self.assertEqual(raw_session.return_value.get.call_count, 2)
+        self.assertEqual([repo["full_name"] for repo in repos], ["octocat/hello-world", "octocat/dotfiles"])
+        self.assertEqual(repos[0]["languages"], {"Python": 1})
+        self.assertEqual(repos[1]["languages"], {})
+
+
+class RawTextFetchTests(unittest.TestCase):
+    def test_returns_small_documents(self) -> None:
+        with mock.patch.object(scraper, "_raw_session") as raw_session:
+            raw_session.return_value.get.return_value = _FakeResponse("# Title\n\nBody")
+            self.assertEqual(scraper._fetch_raw_text("https://example.test/README.md"), "# Title\n\nBody")
+
+    def test_skips_oversized_documents(self) -> None:
+        oversized = _FakeResponse("x" * (scraper._MAX_DOC_BYTES + 1))
+        with mock.patch.object(scraper, "_raw_session") as raw_session:
+            raw_session.return_value.get.return_value = oversized
+            self.assertIsNone(scraper._fetch_raw_text("https://example.test/README.md"))
+
+    def test_skips_missing_documents(self) -> None:
+        with mock.patch.object(scraper, "_raw_session") as raw_session:
+            raw_session.return_value.get.return_value = _FakeResponse("Not Found", status_code=404)
+            self.assertIsNone(scraper._fetch_raw_text("https://example.test/README.md"))
+
+
+class _RawFilesAdapter(BaseAdapter):
+    def __init__(self, files: Dict[str, bytes]) -> None:
+        super().__init__()
+        self.files = files
+
+    def send(self, request: requests.PreparedRequest, **kwargs: Any) -> requests.Response:
+        body = self.files.get(request.path_url)
+        status = 200 if body is not None else 404
+        raw = urllib3.HTTPResponse(
+            body=io.BytesIO(body if body is not None else b"404: Not Found"),
+            headers={"Content-Type": "text/plain; charset=utf-8", "Content-Encoding": "gzip" if body else ""},
+            status=status,
+            preload_content=False,
+        )
+        response = requests.Response()
+        response.status_code = status
+        response.headers = requests.structures.CaseInsensitiveDict(raw.headers)
+        response.encoding = "utf-8"
+        response.raw = raw
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        return response
+
+    def close(self) -> None:
+        return None
+
+
+class FallbackDocumentationTests(unittest.TestCase):
+    def test_default_branch_copy_wins_and_probe_order_is_kept(self) -> None:
+        texts = {
+            "https://raw.githubusercontent.com/octocat/hello/main/README.md": "main readme",
+            "https://raw.githubusercontent.com/octocat/hello/main/docs/index.md": "main index",
+            "https://raw.githubusercontent.com/octocat/hello/master/README.md": "master readme",
+            "https://raw.githubusercontent.com/octocat/hello/master/docs/guide.md": "master guide",
+        }
+        with mock.patch.object(scraper, "_fetch_raw_text", side_effect=texts.get):
+            docs = scraper._collect_documentation_fallback("octocat/hello", "main", extended=False)
+
+        self.assertEqual(
+            list(docs.files.items()),
+            [("README.md", "main readme"), ("docs/index.md", "main index"), ("docs/guide.md", "master guide")],
+        )
+
+
+class TreeDocumentationTests(unittest.TestCase):
+    def test_picks_shallow_doc_files_from_tree(self) -> None:
+        tree = [
+            {"path": "src", "type": "tree"},
+            {"path": "src/notes.md", "type": "blob", "size": 10},
+            {"path": "docs/guide.md", "type": "blob", "size": 10},
+            {"path": "docs/api/deep.md", "type": "blob", "size": 10},
+            {"path": "README.md", "type": "blob", "size": 10},
+            {"path": "setup.py", "type": "blob", "size": 10},
+            {"path": "CHANGELOG.md", "type": "blob", "size": scraper._MAX_DOC_BYTES + 1},
+        ]
+        requested = []
+
+        def fake_retrieve(session, url, max_bytes=None):
+            requested.append(url)
+            return url.rsplit("/", 1)[-1]
+
+        with mock.patch.object(scraper, "retrieve_file", side_effect=fake_retrieve):
+            docs = scraper._collect_documentation(mock.Mock(), "octocat/hello", "main", tree, extended=False)
+
+        self.assertEqual(list(docs.files), ["README.md", "docs/guide.md", "src/notes.md"])
+        self.assertIn("https://raw.githubusercontent.com/octocat/hello/main/docs/guide.md", requested)
+
+    def test_downloads_through_a_real_session(self) -> None:
+        tree = [
+            {"path": "README.md", "type": "blob", "size": 20},
+            {"path": "docs/guide.md", "type": "blob", "size": 20},
+            {"path": "docs/broken.md", "type": "blob", "size": 20},
+            {"path": "docs/missing.md", "type": "blob", "size": 20},
+        ]
+        http = requests.Session()
+        http.mount(
+            "https://raw.githubusercontent.com/",
+            _RawFilesAdapter(
+                {
+                    "/octocat/hello/main/README.md": gzip.compress("# Héllo".encode("utf-8")),
+                    "/octocat/hello/main/docs/guide.md": gzip.compress(b"Guide"),
+                    "/octocat/hello/main/docs/broken.md": b"not gzip at all",
+                }
+            ),
+        )
+        docs = scraper._collect_documentation(GitHubSession(http=http), "octocat/hello", "main", tree, extended=False)
+        self.assertEqual(docs.files, {"README.md": "# Héllo", "docs/guide.md": "Guide"})
+
+
+class _ApiAdapter(BaseAdapter):
+    def __init__(self, handler: Callable[[requests.PreparedRequest], Tuple[int, Any]]) -> None:
+        super().__init__()
+        self.handler = handler
+        self.paths: List[str] = []
+        self._lock = threading.Lock()
+
+    def send(self, request: requests.PreparedRequest, **kwargs: Any) -> requests.Response:
+        with self._lock:
+            self.paths.append(request.path_url.split("?", 1)[0])
+        status, payload = self.handler(request)
+        response = requests.Response()
+        response.status_code = status
+        response.headers = requests.structures.CaseInsensitiveDict({"Content-Type": "application/json"})
+        response._content = json.dumps(payload).encode("utf-8")
+        response.url = request.url
+        response.request = request
+        return response
+
+    def close(self) -> None:
+        return None
+
+
+def _fallback_readme(url: str, **kwargs: Any) -> _FakeResponse:
+    if url.endswith("/main/README.md"):
+        return _FakeResponse("# Fallback readme")
+    return _FakeResponse("Not Found", status_code=404)
+
+
+class RestRateLimitShortCircuitTests(unittest.TestCase):
+    _NAMES = ["alpha", "beta", "gamma", "delta", "epsilon"]
+
+    def _session(self, handler: Callable[[requests.PreparedRequest], Tuple[int, Any]]) -> Tuple[GitHubSession, _ApiAdapter]:
+        adapter = _ApiAdapter(handler)
+        http = requests.Session()
+        http.mount("https://api.github.com/", adapter)
+        return GitHubSession(http=http), adapter
+
+    def _repo_listing(self) -> List[Dict[str, Any]]:
+        return [{"name": name, "full_name": f"octocat/{name}", "default_branch": "main"} for name in self._NAMES]
+
+    def test_rate_limit_switches_remaining_repos_to_fallback_docs(self) -> None:
+        calls = {"count": 0}
+        lock = threading.Lock()
+
+        def handler(request: requests.PreparedRequest) -> Tuple[int, Any]:
+            path = request.path_url.split("?", 1)[0]
+            with lock:
+                calls["count"] += 1
+                # One listing call plus the three bundle calls for the first repo succeed.
+                if calls["count"] > 4:
+                    return 403, {"message": "API rate limit exceeded"}
+            if path == "/users/octocat/repos":
+                return 200, self._repo_listing()
+            if path.endswith("/languages"):
+                return 200, {"Python": 100}
+            if path.endswith("/branches"):
+                return 200, [{"name": "main"}]
+            return 200, {"tree": []}
+
+        session, adapter = self._session(handler)
+        config = AppConfig()
+        config.modes.concurrency = 1
+        with mock.patch.object(scraper, "_raw_session") as raw_session:
+            raw_session.return_value.get.side_effect = _fallback_readme
+            reports = scraper._collect_repo_reports_rest(session, "octocat", config)
+
+        self.assertEqual([report.metrics.name for report in reports], self._NAMES)
+        self.assertTrue(session.rate_limited)
+        self.assertEqual(reports[0].docs.files, {})
+        self.assertEqual(reports[0].metrics.languages, {"Python": 100})
+        for report in reports[1:]:
+            with self.subTest(repo=report.metrics.name):
+                self.assertEqual(report.docs.files, {"README.md": "# Fallback readme"})
+        # Only the second repo's in-flight bundle may reach the API once the 403 comes back.
+        later_paths = adapter.paths[4:]
+        self.assertLessEqual(len(later_paths), 3)
+        self.assertTrue(all(path.startswith("/repos/octocat/beta/") for path in later_paths))
+
+    def test_non_rate_limit_retry_errors_do_not_mark_the_session(self) -> None:
+        def handler(request: requests.PreparedRequest) -> Tuple[int, Any]:
+            if request.path_url.startswith("/users/octocat/repos"):
+                return 200, self._repo_listing()[:1]
+            return 500, {"message": "Server Error"}
+
+        session, _ = self._session(handler)
+        config = AppConfig()
+        config.modes.concurrency = 1
+        with mock.patch.object(github_api._get.retry, "sleep"):
+            with self.assertRaises(scraper.RetryError):
+                scraper._collect_repo_reports_rest(session, "octocat", config)
+        self.assertFalse(session.rate_limited)
+
+
+class GraphQLRepoReportTests(unittest.TestCase):
+    _PAYLOAD = {
+        "name": "hello",
+        "full_name": "octocat/hello",
+        "default_branch": "main",
+        "languages": {"Python": 10},
+        "branches": ["main", "dev"],
+        "readme": "# Hello",
+    }
+
+    def test_collects_docs_from_tree_and_reuses_readme(self) -> None:
+        tree = [
+            {"path": "README.md", "type": "blob", "size": 10},
+            {"path": "CONTRIBUTING.rst", "type": "blob", "size": 10},
+            {"path": "docs/guide.md", "type": "blob", "size": 10},
+            {"path": "docs/api/reference.md", "type": "blob", "size": 10},
+        ]
+        config = AppConfig()
+        config.modes.docs_only = True
+        with mock.patch.object(scraper, "get_repo_tree", return_value=tree), mock.patch.object(
+            scraper, "retrieve_file", side_effect=lambda session, url, max_bytes=None: url.rsplit("/", 1)[-1]
+        ) as retrieve:
+            report = scraper._build_graphql_repo_report(mock.Mock(), dict(self._PAYLOAD), config)
+
+        self.assertEqual(report.docs.files["README.md"], "# Hello")
+        self.assertEqual(
+            sorted(report.docs.files), ["CONTRIBUTING.rst", "README.md", "docs/api/reference.md", "docs/guide.md"]
+        )
+        self.assertEqual(retrieve.call_count, 3)
+        self.assertEqual(report.metrics.popular_branches, ["main", "dev"])
+
+    def test_keeps_readme_when_rate_limited(self) -> None:
+        session = mock.Mock()
+        with mock.patch.object(scraper, "get_repo_tree", side_effect=RateLimitError("rate limit")):
+            report = scraper._build_graphql_repo_report(session, dict(self._PAYLOAD), AppConfig())
+        self.assertEqual(report.docs.files, {"README.md": "# Hello"})
+        session.mark_rate_limited.assert_called_once()
+
+
+class DocFileMatchingTests(unittest.TestCase):
+    def test_matches_doc_prefixes_and_extensions(self) -> None:
+        for name in ("README", "readme.rst", "CONTRIBUTING", "Docs-index.html", "notes.txt", "GUIDE"):
+            with self.subTest(name=name):
+                self.assertTrue(scraper._is_doc_file(name))
+        for name in ("setup.py", "LICENSE", "Makefile", "index.html"):
+            with self.subTest(name=name):
+                self.assertFalse(scraper._is_doc_file(name))
+
+
+class PopularBranchTests(unittest.TestCase):
+    def test_default_branch_first_without_duplicates(self) -> None:
+        branches = ["dev", "main", "dev", "release", "feature"]
+        self.assertEqual(scraper._select_popular_branches("main", branches), ["main", "dev", "release"])
+        self.assertEqual(branches, ["dev", "main", "dev", "release", "feature"])
+
+
+if __name__ == "__main__":  # pragma: no cover
+    unittest.main()